@@ -15,6 +15,8 @@ License: MIT
 
 import streamlit as st
 
+from utils.layout import render_sidebar
+
 st.set_page_config(
     page_title="IVIVC Level Selector",
     page_icon="💊",
@@ -23,21 +25,7 @@ st.set_page_config(
 )
 
 # Sidebar branding
-st.sidebar.markdown("""
-# 💊 IVIVC Framework
-
-**Interactive Decision Tool & Tutorial**
-
-Navigate using the pages above to:
-- 🏠 Learn about IVIVC
-- 🔍 Find your recommended level
-- 📈 Try Level A demo
-- 📊 Try Level B demo
-- 📉 Try Level C demo
-
----
-*All data is synthetic/hypothetical.*
-""")
+render_sidebar()
 
 # Main page content (redirects to Home)
 st.markdown("""
@@ -6,6 +6,13 @@ import streamlit as st
 
 st.set_page_config(page_title="Home — IVIVC", page_icon="🏠", layout="wide")
 
+import sys, os
+_ROOT = os.path.join(os.path.dirname(__file__), '..')
+if _ROOT not in sys.path:  # pages rerun on every interaction; add the path once
+    sys.path.insert(0, _ROOT)
+
+from utils.layout import render_disclaimer
+
 st.title("🏠 In Vitro–In Vivo Correlation (IVIVC)")
 st.markdown("### A Framework for Linking Dissolution to Pharmacokinetics")
 
@@ -147,5 +154,4 @@ with col3:
     *Developed by Harshvardhan Modh.*
     """)
 
-st.markdown("---")
-st.caption("**Disclaimer:** All data shown is synthetic/hypothetical, generated from pharmacokinetic and dissolution mathematical models for educational purposes only. No real experimental data is included.")
+render_disclaimer("No real experimental data is included.")
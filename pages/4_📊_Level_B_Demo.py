@@ -12,9 +12,12 @@ import numpy as np
 st.set_page_config(page_title="Level B Demo — IVIVC", page_icon="📊", layout="wide")
 
 import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+_ROOT = os.path.join(os.path.dirname(__file__), '..')
+if _ROOT not in sys.path:  # pages rerun on every interaction; add the path once
+    sys.path.insert(0, _ROOT)
 
-from utils.synthetic_data import generate_level_b_data
+from utils.synthetic_data import generate_level_b_moments, generate_pathological_example
+from utils.layout import render_disclaimer
 from utils.plotting import (
     COLORS, plot_mdt_vs_mrt, plot_pathological_example,
     plot_dissolution_profiles, plot_pk_profiles, _base_layout,
@@ -82,14 +85,27 @@ p2_k = st.sidebar.slider(
 st.sidebar.markdown("---")
 st.sidebar.info("💡 Adjust the sliders to explore how dissolution rate affects MDT/MRT, and how different profile shapes can yield similar MDT values.")
 
+# Round away float noise from the slider steps so cache keys collapse
+k_fast, k_medium, k_slow = round(k_fast, 2), round(k_medium, 2), round(k_slow, 2)
+p1_burst, p1_burst_k, p2_k = round(p1_burst, 2), round(p1_burst_k, 2), round(p2_k, 2)
+
 # ── Generate Data ────────────────────────────────────────────────────────────
-@st.cache_data
-def get_data(kf, km, ks, p1b, p1bk, p2k):
-    return generate_level_b_data(k_fast=kf, k_medium=km, k_slow=ks,
-                                  p1_burst_frac=p1b, p1_burst_k=p1bk,
-                                  p2_k=p2k)
+# The ER formulations and the pathological example have separate sliders, so
+# they are cached separately: moving a P1/P2 slider does not regenerate the
+# Level A scenario, and vice versa. The page only reads these dicts, so they
+# are cached as shared resources instead of being copied on every rerun.
+@st.cache_resource(max_entries=64)
+def get_moment_data(kf, km, ks):
+    return generate_level_b_moments(k_fast=kf, k_medium=km, k_slow=ks)
+
+
+@st.cache_resource(max_entries=64)
+def get_pathological_data(p1b, p1bk, p2k):
+    return generate_pathological_example(p1_burst_frac=p1b, p1_burst_k=p1bk,
+                                         p2_k=p2k)
 
-data = get_data(k_fast, k_medium, k_slow, p1_burst, p1_burst_k, p2_k)
+data = dict(get_moment_data(k_fast, k_medium, k_slow),
+            pathological=get_pathological_data(p1_burst, p1_burst_k, p2_k))
 
 # =============================================================================
 # Concept: MDT and MRT
@@ -139,7 +155,8 @@ col1, col2 = st.columns(2)
 with col1:
     fig_diss = plot_dissolution_profiles(
         level_a_data['times_dissolution'],
-        level_a_data['dissolution_profiles'],
+        level_a_data['dissolution_matrix'],
+        names=level_a_data['formulation_names'],
         ir_profile=level_a_data['ir_dissolution'],
         title='Dissolution Profiles',
     )
@@ -149,7 +166,8 @@ with col1:
 with col2:
     fig_pk = plot_pk_profiles(
         level_a_data['times_pk'],
-        level_a_data['pk_profiles'],
+        level_a_data['pk_matrix'],
+        names=level_a_data['formulation_names'],
         title='PK Profiles',
         ir_pk=level_a_data['ir_pk'],
     )
@@ -241,15 +259,14 @@ path = data['pathological']
 fig_path = plot_pathological_example(path)
 st.plotly_chart(fig_path, use_container_width=True)
 
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("P1 MDT", f"{path['MDT_P1']:.1f} h")
-with col2:
-    st.metric("P2 MDT", f"{path['MDT_P2']:.1f} h")
-with col3:
-    st.metric("P1 MRT", f"{path['MRT_P1']:.1f} h")
-with col4:
-    st.metric("P2 MRT", f"{path['MRT_P2']:.1f} h")
+metrics = [
+    ("P1 MDT", f"{path['MDT_P1']:.1f} h"),
+    ("P2 MDT", f"{path['MDT_P2']:.1f} h"),
+    ("P1 MRT", f"{path['MRT_P1']:.1f} h"),
+    ("P2 MRT", f"{path['MRT_P2']:.1f} h"),
+]
+for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+    col.metric(label, value)
 
 mdt_diff = abs(path['MDT_P1'] - path['MDT_P2'])
 if mdt_diff < 1.0:
@@ -280,5 +297,4 @@ almost never be used in isolation for regulatory purposes. Combine with
 Level A or C for a complete IVIVC strategy.
 """)
 
-st.markdown("---")
-st.caption("**Disclaimer:** All data shown is synthetic/hypothetical, generated from pharmacokinetic and dissolution mathematical models for educational purposes only.")
+render_disclaimer()
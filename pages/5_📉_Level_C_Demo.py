@@ -13,11 +13,14 @@ import plotly.graph_objects as go
 st.set_page_config(page_title="Level C Demo — IVIVC", page_icon="📉", layout="wide")
 
 import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+_ROOT = os.path.join(os.path.dirname(__file__), '..')
+if _ROOT not in sys.path:  # pages rerun on every interaction; add the path once
+    sys.path.insert(0, _ROOT)
 
-from utils.synthetic_data import generate_level_c_data
+from utils.synthetic_data import DATA_VERSION, generate_level_c_data
 from utils.ivivc_calculations import level_c_correlation, build_correlation_matrix
 from utils.dissolution_models import compute_f1_f2
+from utils.layout import render_disclaimer
 from utils.plotting import (
     COLORS, plot_level_c_scatter, plot_correlation_heatmap,
     plot_f1_f2_bars, _base_layout,
@@ -66,16 +69,73 @@ st.sidebar.markdown("---")
 st.sidebar.info("💡 Adjust dissolution parameters to see how they affect correlations, R² heatmap, and f1/f2 similarity. Bringing B and C closer makes f2 → SIMILAR.")
 
 # ── Generate Data ────────────────────────────────────────────────────────────
-@st.cache_data
-def get_data(fA, tA, bA, fB, tB, bB, fC, tC, bC):
+# Slider values repeat across sessions, so generated datasets are persisted to
+# disk as on the Level A page (persisted caches ignore ttl, so none is set).
+# The data version is part of the key so results from an older generator are
+# not reused after it changes.
+@st.cache_data(persist="disk", max_entries=512, show_spinner=False)
+def _generate_data(version, fA, tA, bA, fB, tB, bB, fC, tC, bC):
     return generate_level_c_data(
         fmax_A=fA, tau_A=tA, burst_A=bA,
         fmax_B=fB, tau_B=tB, burst_B=bB,
         fmax_C=fC, tau_C=tC, burst_C=bC,
     )
 
-data = get_data(fmax_A, tau_A, burst_A, fmax_B, tau_B, burst_B,
-                fmax_C, tau_C, burst_C)
+
+def get_data(fA, tA, bA, fB, tB, bB, fC, tC, bC):
+    return _generate_data(DATA_VERSION, fA, tA, bA, fB, tB, bB, fC, tC, bC)
+
+
+# ── Cached Computations ──────────────────────────────────────────────────────
+# Widget changes rerun the whole page; the regressions, f1/f2 and heatmap
+# only depend on the slider values (and selections), so they are keyed on
+# those and reused until an input actually changes.
+@st.cache_data(show_spinner=False)
+def get_correlation(iv_values, vivo_values):
+    """Level C regression for one parameter pair (tuples of values)."""
+    return level_c_correlation(iv_values, vivo_values)
+
+
+@st.cache_data(show_spinner=False)
+def get_correlation_matrix(params):
+    """R²/slope matrix of every in vitro parameter vs every in vivo parameter."""
+    data = get_data(*params)
+    iv_names = list(data['iv_param_index'])
+    vivo_names = list(data['vivo_param_index'])
+    return build_correlation_matrix(
+        dict(zip(iv_names, data['iv_params_matrix'])),
+        dict(zip(vivo_names, data['vivo_params_matrix'])),
+        iv_names, vivo_names,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def get_f1_f2(params, ref_form, test_form):
+    data = get_data(*params)
+    return compute_f1_f2(data['dissolution'][ref_form],
+                         data['dissolution'][test_form])
+
+
+# Figures are built once per data version and slider combination and shared
+# (read-only) across reruns and sessions.
+@st.cache_resource(max_entries=16)
+def get_heatmap_figure(version, params):
+    matrix = get_correlation_matrix(params)
+    return plot_correlation_heatmap(
+        matrix['r_squared_matrix'],
+        matrix['iv_names'],
+        matrix['vivo_names'],
+        matrix['slope_matrix'],
+    )
+
+
+@st.cache_resource(max_entries=16)
+def get_f1_f2_figure(version, params):
+    return plot_f1_f2_bars(get_data(*params)['f1_f2'])
+
+
+params = (fmax_A, tau_A, burst_A, fmax_B, tau_B, burst_B, fmax_C, tau_C, burst_C)
+data = get_data(*params)
 
 
 # =============================================================================
@@ -166,56 +226,83 @@ the correlation. The scatter plot, regression line, and R² update automatically
 """)
 
 # Get parameter names
-iv_param_names = list(data['iv_params'][data['formulations'][0]].keys())
-vivo_param_names = list(data['vivo_params'][data['formulations'][0]].keys())
-
-col1, col2 = st.columns(2)
-with col1:
-    selected_iv = st.selectbox(
-        "In Vitro Parameter:", iv_param_names,
-        index=iv_param_names.index('DE (%)'),
-        key="iv_select"
-    )
-with col2:
-    selected_vivo = st.selectbox(
-        "In Vivo Parameter:", vivo_param_names,
-        index=0,
-        key="vivo_select"
+iv_param_names = list(data['iv_param_index'])
+vivo_param_names = list(data['vivo_param_index'])
+
+# The selectboxes only affect the scatter, metrics and n=2 comparison below,
+# so changing them reruns just this fragment rather than the whole page.
+# Everything that depends on the selected pair lives inside the fragment so
+# it can never show numbers for a previous selection.
+@st.fragment
+def correlation_explorer(data, iv_param_names, vivo_param_names):
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_iv = st.selectbox(
+            "In Vitro Parameter:", iv_param_names,
+            index=iv_param_names.index('DE (%)'),
+            key="iv_select"
+        )
+    with col2:
+        selected_vivo = st.selectbox(
+            "In Vivo Parameter:", vivo_param_names,
+            index=0,
+            key="vivo_select"
+        )
+
+    # Get values
+    iv_values = data['iv_params_matrix'][data['iv_param_index'][selected_iv]]
+    vivo_values = data['vivo_params_matrix'][data['vivo_param_index'][selected_vivo]]
+
+    # Compute correlation
+    corr = get_correlation(tuple(iv_values), tuple(vivo_values))
+
+    # Plot
+    fig_scatter = plot_level_c_scatter(
+        iv_values, vivo_values,
+        selected_iv, selected_vivo,
+        data['formulations'],
+        corr['slope'], corr['intercept'], corr['r_squared'],
     )
+    st.plotly_chart(fig_scatter, use_container_width=True)
+
+    # Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("R²", f"{corr['r_squared']:.4f}")
+    with col2:
+        st.metric("Slope", f"{corr['slope']:.4f}")
+    with col3:
+        slope_dir = "Positive ↑" if corr['slope'] > 0 else "Negative ↓"
+        st.metric("Direction", slope_dir)
+    with col4:
+        st.metric("p-value", f"{corr['p_value']:.4f}")
+
+    # Mechanistic interpretation
+    if corr['slope'] > 0:
+        st.info(f"**Positive slope:** Higher {selected_iv} → higher {selected_vivo}. This suggests that increased dissolution directly drives the in vivo response.")
+    else:
+        st.info(f"**Negative slope:** Higher {selected_iv} → lower {selected_vivo}. This may indicate that faster release leads to lower sustained exposure (common for depot formulations).")
 
-# Get values
-iv_values = [data['iv_params'][name][selected_iv] for name in data['formulations']]
-vivo_values = [data['vivo_params'][name][selected_vivo] for name in data['formulations']]
+    # n=2 vs n=3 for the selected pair (see Step 5)
+    show_n2 = st.toggle("Show n=2 comparison (remove Formulation C)", value=False,
+                        key="show_n2")
 
-# Compute correlation
-corr = level_c_correlation(iv_values, vivo_values)
+    if show_n2:
+        # Take only first 2 formulations
+        iv_2 = iv_values[:2]
+        vivo_2 = vivo_values[:2]
+        corr_2 = get_correlation(tuple(iv_2), tuple(vivo_2))
 
-# Plot
-fig_scatter = plot_level_c_scatter(
-    iv_values, vivo_values,
-    selected_iv, selected_vivo,
-    data['formulations'],
-    corr['slope'], corr['intercept'], corr['r_squared'],
-)
-st.plotly_chart(fig_scatter, use_container_width=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"**n=3 formulations:** R² = {corr['r_squared']:.4f}")
+        with col2:
+            st.markdown(f"**n=2 formulations:** R² = {corr_2['r_squared']:.4f} (trivially perfect)")
+
+        st.warning("⚠️ With n=2, R² is always 1.00 regardless of the biological reality. This demonstrates why ≥3 formulations are needed for meaningful Level C IVIVC.")
 
-# Metrics
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("R²", f"{corr['r_squared']:.4f}")
-with col2:
-    st.metric("Slope", f"{corr['slope']:.4f}")
-with col3:
-    slope_dir = "Positive ↑" if corr['slope'] > 0 else "Negative ↓"
-    st.metric("Direction", slope_dir)
-with col4:
-    st.metric("p-value", f"{corr['p_value']:.4f}")
 
-# Mechanistic interpretation
-if corr['slope'] > 0:
-    st.info(f"**Positive slope:** Higher {selected_iv} → higher {selected_vivo}. This suggests that increased dissolution directly drives the in vivo response.")
-else:
-    st.info(f"**Negative slope:** Higher {selected_iv} → lower {selected_vivo}. This may indicate that faster release leads to lower sustained exposure (common for depot formulations).")
+correlation_explorer(data, iv_param_names, vivo_param_names)
 
 
 # =============================================================================
@@ -230,28 +317,7 @@ Cell values show R² and slope direction (↑ positive, ↓ negative).
 Use the dropdowns above to explore any specific pair in detail.
 """)
 
-# Build full matrix
-in_vitro_dict = {}
-for param_name in iv_param_names:
-    in_vitro_dict[param_name] = [data['iv_params'][name][param_name]
-                                  for name in data['formulations']]
-
-in_vivo_dict = {}
-for param_name in vivo_param_names:
-    in_vivo_dict[param_name] = [data['vivo_params'][name][param_name]
-                                 for name in data['formulations']]
-
-matrix = build_correlation_matrix(
-    in_vitro_dict, in_vivo_dict,
-    iv_param_names, vivo_param_names,
-)
-
-fig_heatmap = plot_correlation_heatmap(
-    matrix['r_squared_matrix'],
-    matrix['iv_names'],
-    matrix['vivo_names'],
-    matrix['slope_matrix'],
-)
+fig_heatmap = get_heatmap_figure(DATA_VERSION, params)
 st.plotly_chart(fig_heatmap, use_container_width=True)
 
 # Key observations
@@ -283,36 +349,37 @@ The **f1/f2 framework** (FDA/EMA) quantifies dissolution profile similarity:
 # Interactive f1/f2 calculator
 st.subheader("f1/f2 Calculator")
 
-col1, col2 = st.columns(2)
-with col1:
-    ref_form = st.selectbox("Reference formulation:", data['formulations'], key="f1f2_ref")
-with col2:
-    available_test = [f for f in list(data['formulations']) + ['Solution'] if f != ref_form]
-    test_form = st.selectbox("Test formulation:", available_test, key="f1f2_test")
+@st.fragment
+def f1_f2_calculator(params, formulations):
+    col1, col2 = st.columns(2)
+    with col1:
+        ref_form = st.selectbox("Reference formulation:", formulations, key="f1f2_ref")
+    with col2:
+        available_test = [f for f in list(formulations) + ['Solution'] if f != ref_form]
+        test_form = st.selectbox("Test formulation:", available_test, key="f1f2_test")
 
-# Get profiles
-ref_profile = data['dissolution'][ref_form]
-test_profile = data['dissolution'].get(test_form, data['dissolution']['Solution'])
+    f1, f2 = get_f1_f2(params, ref_form, test_form)
 
-f1, f2 = compute_f1_f2(ref_profile, test_profile)
+    col1, col2 = st.columns(2)
+    with col1:
+        if f1 <= 15:
+            st.success(f"**f1 = {f1:.1f}** ≤ 15 → **SIMILAR** ✅")
+        else:
+            st.error(f"**f1 = {f1:.1f}** > 15 → **DIFFERENT** ❌")
+    with col2:
+        if f2 >= 50:
+            st.success(f"**f2 = {f2:.1f}** ≥ 50 → **SIMILAR** ✅")
+        else:
+            st.error(f"**f2 = {f2:.1f}** < 50 → **DIFFERENT** ❌")
 
-col1, col2 = st.columns(2)
-with col1:
-    if f1 <= 15:
-        st.success(f"**f1 = {f1:.1f}** ≤ 15 → **SIMILAR** ✅")
-    else:
-        st.error(f"**f1 = {f1:.1f}** > 15 → **DIFFERENT** ❌")
-with col2:
-    if f2 >= 50:
-        st.success(f"**f2 = {f2:.1f}** ≥ 50 → **SIMILAR** ✅")
-    else:
-        st.error(f"**f2 = {f2:.1f}** < 50 → **DIFFERENT** ❌")
+
+f1_f2_calculator(params, data['formulations'])
 
 # Pre-computed f1/f2 summary
 st.markdown("---")
 st.subheader("All Pairwise f1/f2 Comparisons")
 
-fig_f1f2 = plot_f1_f2_bars(data['f1_f2'])
+fig_f1f2 = get_f1_f2_figure(DATA_VERSION, params)
 st.plotly_chart(fig_f1f2, use_container_width=True)
 
 st.markdown("*Bring B and C formulations closer in the sidebar (similar τ and Fmax) to push their f2 above 50 (SIMILAR).*")
@@ -331,23 +398,10 @@ direction and magnitude.
 
 With **n = 3** formulations (as shown here), R² values range realistically,
 providing genuine statistical power to distinguish strong from weak correlations.
-""")
-
-show_n2 = st.toggle("Show n=2 comparison (remove Formulation C)", value=False)
 
-if show_n2:
-    # Take only first 2 formulations
-    iv_2 = iv_values[:2]
-    vivo_2 = vivo_values[:2]
-    corr_2 = level_c_correlation(iv_2, vivo_2)
-
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown(f"**n=3 formulations:** R² = {corr['r_squared']:.4f}")
-    with col2:
-        st.markdown(f"**n=2 formulations:** R² = {corr_2['r_squared']:.4f} (trivially perfect)")
-
-    st.warning("⚠️ With n=2, R² is always 1.00 regardless of the biological reality. This demonstrates why ≥3 formulations are needed for meaningful Level C IVIVC.")
+Turn on **Show n=2 comparison** under the Step 2 explorer to see this for the
+selected parameter pair.
+""")
 
 # Slope direction guide
 st.markdown("---")
@@ -363,5 +417,4 @@ Slope direction provides **mechanistic insight** into how the formulation
 variable influences the pharmacokinetic outcome.
 """)
 
-st.markdown("---")
-st.caption("**Disclaimer:** All data shown is synthetic/hypothetical, generated from pharmacokinetic and dissolution mathematical models for educational purposes only.")
+render_disclaimer()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from utils.deconvolution import numerical_deconvolution
+
+
+def _point_area_conc(times, rate, h, dt):
+    """Forward point-area model that numerical_deconvolution inverts."""
+    dt_forward = np.diff(times)
+    conc = np.empty(len(times))
+    conc[0] = rate[0] * h[0] * dt
+    for i in range(1, len(times)):
+        conc[i] = (np.dot(rate[:i], h[i:0:-1] * dt_forward[:i])
+                   + rate[i] * h[0] * dt_forward[i - 1])
+    return conc
+
+
+def test_impulse_response_longer_than_times():
+    times = np.arange(25, dtype=float)
+    h = np.exp(-0.1 * np.arange(40))
+    rate = np.exp(-0.3 * times)
+    conc = _point_area_conc(times, rate, h, dt=0.1)
+
+    result = numerical_deconvolution(times, conc, h, dt=0.1)
+
+    np.testing.assert_allclose(result['input_rate'], rate, rtol=1e-10)
+    truncated = numerical_deconvolution(times, conc, h[:25], dt=0.1)
+    np.testing.assert_array_equal(result['input_rate'], truncated['input_rate'])
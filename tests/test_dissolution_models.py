@@ -0,0 +1,30 @@
+import numpy as np
+
+from utils.dissolution_models import weibull_release
+
+TIMES = np.array([0, 1, 6, 24, 72, 168, 336, 504, 672, 720], dtype=float)
+
+
+def test_weibull_scalar_time_gives_scalar():
+    release = weibull_release(24.0, fmax=88, tau=300, beta=0.75,
+                              burst_frac=15, burst_tau=8)
+    assert np.ndim(release) == 0
+
+
+def test_weibull_broadcasts_every_parameter():
+    params = dict(fmax=[88, 68], tau=[300, 420], beta=[0.75, 0.70],
+                  burst_frac=[15, 7], burst_tau=[8, 10])
+    expected = np.array([
+        weibull_release(TIMES, **{k: v[i] for k, v in params.items()})
+        for i in range(2)
+    ])
+
+    for name, values in params.items():
+        column = {k: v[0] for k, v in params.items()}
+        column[name] = np.array(values)[:, np.newaxis]
+        release = weibull_release(TIMES, **column)
+        assert release.shape == (2, len(TIMES))
+        np.testing.assert_allclose(release[0], expected[0])
+
+    columns = {k: np.array(v)[:, np.newaxis] for k, v in params.items()}
+    np.testing.assert_allclose(weibull_release(TIMES, **columns), expected)
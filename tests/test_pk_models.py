@@ -0,0 +1,25 @@
+import numpy as np
+
+from utils.pk_models import biexponential_depot
+
+TIMES = np.array([0.5, 1, 2, 4, 6, 8, 12, 24, 48, 72, 168, 336, 504, 672, 840])
+PARAMS = [(0.90, 0.004, 1.2, 0.08, 0.0006),
+          (0.60, 0.0025, 0.20, 0.20, 0.0005)]
+
+
+def test_biexponential_scalar_time_gives_scalar():
+    assert np.ndim(biexponential_depot(24.0, *PARAMS[0])) == 0
+
+
+def test_biexponential_broadcasts_every_parameter():
+    expected = np.array([biexponential_depot(TIMES, *p) for p in PARAMS])
+    columns = np.array(PARAMS).T[:, :, np.newaxis]
+
+    for i in range(len(PARAMS[0])):
+        args = list(PARAMS[0])
+        args[i] = columns[i]
+        conc = biexponential_depot(TIMES, *args)
+        assert conc.shape == (2, len(TIMES))
+        np.testing.assert_allclose(conc[0], expected[0])
+
+    np.testing.assert_allclose(biexponential_depot(TIMES, *columns), expected)
@@ -1 +1,58 @@
 # IVIVC Level Selector — Utility modules
+#
+# Submodules are imported on first attribute access, so pages that only need
+# the layout helpers or the Level Selector do not pay for importing SciPy and
+# Plotly on a cold start.
+
+import importlib
+
+_EXPORTS = {
+    'dissolution_models': (
+        'first_order_release', 'weibull_release', 'higuchi_release',
+        'compute_mdt', 'compute_vdt', 'compute_de', 'compute_f1_f2',
+    ),
+    'pk_models': (
+        'one_compartment_oral', 'impulse_response_1comp',
+        'convolve_dissolution_pk', 'ConvolvePK', 'biexponential_depot',
+        'compute_auc', 'compute_auc_cumulative', 'compute_exposure',
+        'compute_aumc', 'compute_mrt',
+    ),
+    'deconvolution': (
+        'wagner_nelson', 'wagner_nelson_batch', 'numerical_deconvolution',
+    ),
+    'ivivc_calculations': (
+        'level_a_correlation', 'interpolation_matrix', 'interpolate_profiles',
+        'level_c_correlation',
+        'compute_prediction_error', 'build_correlation_matrix',
+    ),
+    'synthetic_data': (
+        'DATA_VERSION', 'LEVEL_A_KE', 'LEVEL_A_VD', 'LEVEL_A_DOSE', 'LEVEL_A_TIMES_FINE',
+        'generate_level_a_data', 'generate_level_b_data', 'generate_level_c_data',
+        'generate_level_b_moments', 'generate_pathological_example',
+    ),
+    'level_selection': ('compute_recommendation',),
+    'plotting': (
+        'COLORS', 'plot_dissolution_profiles', 'plot_pk_profiles',
+        'plot_absorption_vs_dissolution', 'plot_level_a_correlation',
+        'plot_pe_validation', 'plot_mdt_vs_mrt', 'plot_pathological_example',
+        'plot_level_c_scatter', 'plot_correlation_heatmap', 'plot_f1_f2_bars',
+    ),
+    'layout': ('render_sidebar', 'render_disclaimer'),
+}
+
+_MODULE_FOR = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_FOR)
+
+
+def __getattr__(name):
+    module = _MODULE_FOR.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,6 +8,7 @@ All data is synthetic/hypothetical for educational purposes only.
 """
 
 import numpy as np
+from scipy.linalg import solve_triangular, toeplitz
 
 
 def wagner_nelson(times, conc, ke):
@@ -39,36 +40,81 @@ def wagner_nelson(times, conc, ke):
         'auc_total': AUC(0,∞),
         'amount_absorbed': C(t) + ke·AUC(0,t) (unnormalized)
     """
-    times = np.asarray(times, dtype=float)
     conc = np.asarray(conc, dtype=float)
+    result = wagner_nelson_batch(times, conc[np.newaxis, :], ke)
+
+    return {
+        'times': result['times'],
+        'fraction_absorbed': result['fraction_absorbed'][0],
+        'auc_cumulative': result['auc_cumulative'][0],
+        'auc_total': float(result['auc_total'][0]),
+        'amount_absorbed': result['amount_absorbed'][0],
+    }
+
+
+def wagner_nelson_batch(times, conc, ke, auc_cumulative=None):
+    """
+    Wagner-Nelson deconvolution of several profiles on a shared time grid.
+
+    Applies the same calculation as wagner_nelson to every row of conc at
+    once, instead of once per formulation.
 
-    # Cumulative AUC(0,t) using trapezoidal rule
-    auc_cumulative = np.zeros_like(times)
-    for i in range(1, len(times)):
-        auc_cumulative[i] = auc_cumulative[i - 1] + \
-            0.5 * (conc[i - 1] + conc[i]) * (times[i] - times[i - 1])
+    Parameters
+    ----------
+    times : array-like
+        Time points (hours), shared by all profiles.
+    conc : array-like
+        Plasma concentrations, shape (n_profiles, n_times).
+    ke : float or array-like
+        First-order elimination rate constant (h⁻¹), either shared or one
+        per profile.
+    auc_cumulative : array-like, optional
+        Cumulative AUC(0,t) of conc, same shape, if the caller has already
+        integrated the profiles; computed here otherwise.
+
+    Returns
+    -------
+    dict
+        Same keys as wagner_nelson, with one row (or, for 'auc_total', one
+        value) per profile.
+    """
+    times = np.asarray(times, dtype=float)
+    conc = np.asarray(conc, dtype=float)
+    ke = np.asarray(ke, dtype=float)
+    if ke.ndim:
+        ke = ke[:, np.newaxis]  # one rate per row
+
+    # Cumulative AUC(0,t) using trapezoidal rule, summed straight into the
+    # output buffer behind its leading zero
+    if auc_cumulative is None:
+        trapezoids = 0.5 * (conc[:, :-1] + conc[:, 1:]) * np.diff(times)
+        auc_cumulative = np.empty_like(conc)
+        auc_cumulative[:, 0] = 0.0
+        np.cumsum(trapezoids, axis=1, out=auc_cumulative[:, 1:])
+    else:
+        auc_cumulative = np.asarray(auc_cumulative, dtype=float)
 
     # AUC(0,∞) = AUC(0,tlast) + C(tlast)/ke
-    auc_total = auc_cumulative[-1] + conc[-1] / ke if ke > 0 else auc_cumulative[-1]
+    auc_last = auc_cumulative[:, -1:]
+    auc_total = auc_last + np.divide(conc[:, -1:], ke,
+                                     out=np.zeros_like(auc_last), where=ke > 0)
 
     # Amount absorbed (unnormalized)
     amount_absorbed = conc + ke * auc_cumulative
 
     # Fraction absorbed (normalized to 0–1)
     denom = ke * auc_total
-    if denom > 0:
-        fraction_absorbed = amount_absorbed / denom
-    else:
-        fraction_absorbed = np.zeros_like(times)
+    fraction_absorbed = np.divide(amount_absorbed, denom,
+                                  out=np.zeros_like(conc), where=denom > 0)
 
-    # Clip to [0, 1] for numerical stability
-    fraction_absorbed = np.clip(fraction_absorbed, 0.0, 1.0)
+    # Clip to [0, 1] for numerical stability (in place; the buffer is ours)
+    np.clip(fraction_absorbed, 0.0, 1.0, out=fraction_absorbed)
 
     return {
         'times': times,
         'fraction_absorbed': fraction_absorbed,
         'auc_cumulative': auc_cumulative,
-        'auc_total': auc_total,
+        'auc_total': auc_total[:, 0],
         'amount_absorbed': amount_absorbed,
     }
 
@@ -99,33 +145,43 @@ def numerical_deconvolution(times, conc, impulse_response, dt=0.1):
     """
     times = np.asarray(times, dtype=float)
     conc = np.asarray(conc, dtype=float)
-    h = np.asarray(impulse_response, dtype=float)
-
     n = len(times)
-    r = np.zeros(n)
-
-    # Iterative point-area deconvolution
-    for i in range(n):
-        sum_prev = 0.0
-        for j in range(i):
-            # Use trapezoidal approximation
-            if i - j < n:
-                sum_prev += r[j] * h[i - j] * (times[min(j + 1, n - 1)] - times[j])
-
-        if h[0] > 0 and i > 0:
-            time_step = times[i] - times[i - 1]
-            r[i] = (conc[i] - sum_prev) / (h[0] * time_step) if time_step > 0 else 0.0
-        elif i == 0 and h[0] > 0:
-            r[0] = conc[0] / (h[0] * dt)
+    # Only h at lags below n enters the recursion; a longer impulse response
+    # is truncated so the system stays n×n
+    h = np.asarray(impulse_response, dtype=float)[:n]
+
+    dt_forward = np.diff(times)
+
+    if h[0] > 0 and np.all(dt_forward > 0):
+        # The point-area recursion is the forward substitution of a
+        # lower-triangular system L·r = C with
+        #   L[i, j] = h[i-j]·(t[j+1]-t[j])  for j < i,
+        #   L[i, i] = h[0]·(t[i]-t[i-1]),    L[0, 0] = h[0]·dt,
+        # so it is solved in one LAPACK call.
+        system = np.tril(toeplitz(h), -1)
+        system[:, :-1] *= dt_forward
+        system[np.diag_indices(n)] = h[0] * np.concatenate(([dt], dt_forward))
+        r = solve_triangular(system, conc, lower=True)
+    else:
+        # h[0] ≤ 0 or repeated timepoints: step through the recursion, which
+        # leaves the inputs it cannot resolve at zero
+        r = np.zeros(n)
+        for i in range(n):
+            # Contribution of all earlier inputs: Σ_j r[j]·h[i-j]·(t[j+1]-t[j])
+            sum_prev = np.dot(r[:i], h[i:0:-1] * dt_forward[:i])
+
+            if h[0] > 0 and i > 0:
+                time_step = times[i] - times[i - 1]
+                r[i] = (conc[i] - sum_prev) / (h[0] * time_step) if time_step > 0 else 0.0
+            elif i == 0 and h[0] > 0:
+                r[0] = conc[0] / (h[0] * dt)
 
     # Ensure non-negative
     r = np.maximum(r, 0.0)
 
     # Cumulative fraction absorbed
     fa_cumulative = np.zeros(n)
-    for i in range(1, n):
-        fa_cumulative[i] = fa_cumulative[i - 1] + \
-            0.5 * (r[i - 1] + r[i]) * (times[i] - times[i - 1])
+    np.cumsum(0.5 * (r[:-1] + r[1:]) * dt_forward, out=fa_cumulative[1:])
 
     # Normalize to 0-1
     if fa_cumulative[-1] > 0:
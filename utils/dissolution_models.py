@@ -19,7 +19,7 @@ def first_order_release(t, k, f_max=100.0):
     Parameters
     ----------
     t : array-like
-        Time points (hours).
+        Time points (hours). float32 input gives a float32 result.
     k : float
         First-order rate constant (h⁻¹).
     f_max : float
@@ -30,8 +30,15 @@ def first_order_release(t, k, f_max=100.0):
     np.ndarray
         Cumulative % released at each time point.
     """
-    t = np.asarray(t, dtype=float)
-    return f_max * (1.0 - np.exp(-k * t))
+    t = np.asarray(t)
+    if t.dtype != np.float32:  # float32 input is evaluated in float32
+        t = t.astype(float, copy=False)
+    # Evaluated in place in a single buffer: expm1(-kt) = -(1 - exp(-kt)),
+    # which also keeps full precision near t = 0
+    release = np.asarray(np.multiply(t, -k, dtype=t.dtype))
+    np.expm1(release, out=release)
+    release *= -f_max
+    return release[()]  # scalar t still gives a scalar
 
 
 def weibull_release(t, fmax, tau, beta, burst_frac=0.0, burst_tau=1.0):
@@ -45,26 +52,42 @@ def weibull_release(t, fmax, tau, beta, burst_frac=0.0, burst_tau=1.0):
     ----------
     t : array-like
         Time points (hours).
-    fmax : float
+    fmax : float or array-like
         Maximum total release (%).
-    tau : float
+    tau : float or array-like
         Scale parameter (hours).
-    beta : float
+    beta : float or array-like
         Shape parameter (dimensionless).
-    burst_frac : float
+    burst_frac : float or array-like
         Fraction released in burst phase (%).
-    burst_tau : float
+    burst_tau : float or array-like
         Burst time constant (hours).
 
+    Parameters given as arrays are broadcast against t, e.g. columns of
+    shape (n, 1) give one profile per row.
+
     Returns
     -------
     np.ndarray
         Cumulative % released at each time point.
     """
     t = np.asarray(t, dtype=float)
-    burst = burst_frac * (1.0 - np.exp(-t / burst_tau))
-    sustained = (fmax - burst_frac) * (1.0 - np.exp(-((t / tau) ** beta)))
-    return burst + sustained
+    # Each phase is evaluated in place in one buffer, using
+    # expm1(-x) = -(1 - exp(-x)) as in first_order_release. The buffers take
+    # the shape t broadcasts to with every parameter, not just with tau.
+    shape = np.broadcast_shapes(t.shape, *map(np.shape, (fmax, tau, beta,
+                                                         burst_frac, burst_tau)))
+    release = np.divide(t, tau, out=np.empty(shape))
+    np.power(release, beta, out=release)
+    np.negative(release, out=release)
+    np.expm1(release, out=release)
+    release *= -(fmax - burst_frac)
+
+    burst = np.divide(t, -burst_tau, out=np.empty(shape))
+    np.expm1(burst, out=burst)
+    burst *= -burst_frac
+    release += burst
+    return release[()]  # scalar t still gives a scalar
 
 
 def higuchi_release(t, k_h, f_max=100.0):
@@ -88,8 +111,9 @@ def higuchi_release(t, k_h, f_max=100.0):
         Cumulative % released at each time point.
     """
     t = np.asarray(t, dtype=float)
-    release = k_h * np.sqrt(t)
-    return np.minimum(release, f_max)
+    release = np.asarray(np.sqrt(t))
+    release *= k_h
+    return np.minimum(release, f_max, out=release)[()]
 
 
 def compute_mdt(times, release):
@@ -103,23 +127,70 @@ def compute_mdt(times, release):
     times : array-like
         Time points (hours).
     release : array-like
-        Cumulative % released.
+        Cumulative % released. A 2D array is treated row by row.
 
     Returns
     -------
-    float
-        Mean dissolution time (hours).
+    float or np.ndarray
+        Mean dissolution time (hours), one value per row for 2D input.
+    """
+    times = np.asarray(times, dtype=float)
+    release = np.asarray(release, dtype=float)
+
+    delta_f = np.diff(release, axis=-1)
+    t_mid = (times[:-1] + times[1:]) / 2.0
+    total_df = np.sum(delta_f, axis=-1)
+    weighted = np.sum(t_mid * delta_f, axis=-1)
+
+    if release.ndim > 1:
+        return np.divide(weighted, total_df, out=np.zeros_like(weighted),
+                         where=total_df != 0)
+
+    if total_df == 0:
+        return 0.0
+
+    return weighted / total_df
+
+
+def compute_vdt(times, release, mdt=None):
+    """
+    Compute Variance of Dissolution Time (VDT) from release profile.
+
+    VDT = Σ((t_mid - MDT)² * ΔF) / Σ(ΔF)
+
+    Parameters
+    ----------
+    times : array-like
+        Time points (hours).
+    release : array-like
+        Cumulative % released. A 2D array is treated row by row.
+    mdt : float or array-like, optional
+        Precomputed MDT (one per row for 2D input); computed if omitted.
+
+    Returns
+    -------
+    float or np.ndarray
+        Variance of dissolution time (h²), one value per row for 2D input.
     """
     times = np.asarray(times, dtype=float)
     release = np.asarray(release, dtype=float)
+    if mdt is None:
+        mdt = compute_mdt(times, release)
 
-    delta_f = np.diff(release)
+    delta_f = np.diff(release, axis=-1)
     t_mid = (times[:-1] + times[1:]) / 2.0
+    total_df = np.sum(delta_f, axis=-1)
+    spread = t_mid - np.asarray(mdt, dtype=float)[..., np.newaxis]
+    weighted = np.sum(spread ** 2 * delta_f, axis=-1)
 
-    if np.sum(delta_f) == 0:
+    if release.ndim > 1:
+        return np.divide(weighted, total_df, out=np.zeros_like(weighted),
+                         where=total_df > 0)
+
+    if total_df <= 0:
         return 0.0
 
-    return np.sum(t_mid * delta_f) / np.sum(delta_f)
+    return float(weighted / total_df)
 
 
 def compute_de(times, release):
@@ -166,24 +237,38 @@ def compute_f1_f2(ref_profile, test_profile):
     ref_profile : array-like
         Reference dissolution profile (% released).
     test_profile : array-like
-        Test dissolution profile (% released).
+        Test dissolution profile (% released). Profiles with leading
+        dimensions are broadcast against each other along the last (time)
+        axis, e.g. P[:, None] and P[None] compare every pair of rows of P.
 
     Returns
     -------
     tuple
-        (f1, f2) — difference and similarity factors.
+        (f1, f2) — difference and similarity factors (floats, or arrays of
+        the broadcast leading shape).
     """
     ref = np.asarray(ref_profile, dtype=float)
     test = np.asarray(test_profile, dtype=float)
 
-    n = len(ref)
-    diff = np.abs(ref - test)
+    diff = ref - test  # formed once and shared by both factors
+    n = diff.shape[-1]
+
+    if diff.ndim > 1:
+        ref_total = ref.sum(axis=-1)
+        f1 = np.divide(np.abs(diff).sum(axis=-1), ref_total,
+                       out=np.zeros(diff.shape[:-1]), where=ref_total > 0)
+        f1 *= 100.0
+        mean_sq_diff = np.einsum('...i,...i->...', diff, diff) / n
+        f2 = 50.0 * np.log10(100.0 / np.sqrt(1.0 + mean_sq_diff))
+        return f1, f2
+
+    ref_total = ref.sum()
 
     # f1 — difference factor
-    f1 = (np.sum(diff) / np.sum(ref)) * 100.0 if np.sum(ref) > 0 else 0.0
+    f1 = (np.abs(diff).sum() / ref_total) * 100.0 if ref_total > 0 else 0.0
 
     # f2 — similarity factor
-    mean_sq_diff = np.sum((ref - test) ** 2) / n
+    mean_sq_diff = np.dot(diff, diff) / n
     f2 = 50.0 * np.log10(100.0 / np.sqrt(1.0 + mean_sq_diff))
 
     return f1, f2
@@ -10,6 +10,83 @@ import numpy as np
 from scipy import stats
 
 
+def _fit_lines(x, y):
+    """
+    Ordinary least-squares lines through many (x, y) sets at once.
+
+    The last axis holds the observations; the leading axes of x and y are
+    broadcast against each other, so e.g. x[:, None, :] and y[None, :, :]
+    fit every x row against every y row. Each fit gives the same slope,
+    intercept, R², two-sided p-value and slope standard error as
+    scipy.stats.linregress; a constant x gives a flat line with R² = 0
+    and p = 1 instead of an error.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (slope, intercept, r_squared, p_value, std_err), each shaped like
+        the broadcast leading axes.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.shape[-1]
+
+    x_mean = x.mean(axis=-1)
+    y_mean = y.mean(axis=-1)
+    dx = x - x_mean[..., None]
+    dy = y - y_mean[..., None]
+    return _fit_from_sums(
+        x_mean, y_mean,
+        (dx * dx).sum(axis=-1), (dy * dy).sum(axis=-1), (dx * dy).sum(axis=-1),
+        n,
+    )
+
+
+def _fit_from_sums(x_mean, y_mean, ss_xx, ss_yy, ss_xy, n):
+    """
+    Line-fit statistics of _fit_lines from the means and centred sums of
+    squares/cross-products of n observations (all broadcast together).
+    """
+    ss_xx, ss_yy, ss_xy = np.broadcast_arrays(ss_xx, ss_yy, ss_xy)
+
+    fitted = ss_xx > 0
+    correlated = fitted & (ss_yy > 0)
+    slope = np.divide(ss_xy, ss_xx, out=np.zeros(ss_xy.shape), where=fitted)
+    intercept = y_mean - slope * x_mean
+    r_squared = np.divide(ss_xy * ss_xy, ss_xx * ss_yy,
+                          out=np.zeros(ss_xy.shape), where=correlated)
+    np.minimum(r_squared, 1.0, out=r_squared)
+
+    df = n - 2
+    if df < 1:
+        # Two points define the line exactly
+        p_value = np.where(correlated, 0.0, 1.0)
+        return slope, intercept, r_squared, p_value, np.zeros(ss_xy.shape)
+
+    one_minus_r2 = 1.0 - r_squared
+    std_err = np.sqrt(np.divide(one_minus_r2 * ss_yy, ss_xx * df,
+                                out=np.zeros(ss_xy.shape), where=fitted))
+    # Small offset keeps t finite for a perfect fit, as linregress does
+    t_stat = np.sqrt(r_squared * df / (one_minus_r2 + 1.0e-20))
+    p_value = np.where(fitted, 2 * stats.t.sf(t_stat, df), 1.0)
+
+    return slope, intercept, r_squared, p_value, std_err
+
+
+def _fit_line(x, y):
+    """
+    Ordinary least-squares line through (x, y); see _fit_lines.
+
+    Returns
+    -------
+    tuple
+        (slope, intercept, r_squared, p_value, std_err)
+    """
+    if np.ptp(x) == 0:
+        raise ValueError("Cannot fit a line when all x values are identical.")
+    return tuple(float(v) for v in _fit_lines(x, y))
+
+
 def level_a_correlation(dissolved_fractions, absorbed_fractions):
     """
     Level A IVIVC: Point-to-point correlation between
@@ -17,10 +94,12 @@ def level_a_correlation(dissolved_fractions, absorbed_fractions):
 
     Parameters
     ----------
-    dissolved_fractions : list of array-like
-        In vitro % dissolved for each formulation (list of arrays).
-    absorbed_fractions : list of array-like
-        In vivo % absorbed for each formulation (list of arrays).
+    dissolved_fractions : list of array-like or np.ndarray
+        In vitro % dissolved for each formulation (list of arrays, or a
+        2D array with one row per formulation).
+    absorbed_fractions : list of array-like or np.ndarray
+        In vivo % absorbed for each formulation (same layout as
+        dissolved_fractions).
 
     Returns
     -------
@@ -28,19 +107,26 @@ def level_a_correlation(dissolved_fractions, absorbed_fractions):
         'slope', 'intercept', 'r_squared', 'p_value', 'std_err',
         'all_dissolved', 'all_absorbed' (pooled data arrays)
     """
-    all_dissolved = []
-    all_absorbed = []
-
-    for diss, abso in zip(dissolved_fractions, absorbed_fractions):
-        diss = np.asarray(diss, dtype=float)
-        abso = np.asarray(abso, dtype=float)
-        # Use minimum length if mismatched
-        n = min(len(diss), len(abso))
-        all_dissolved.extend(diss[:n])
-        all_absorbed.extend(abso[:n])
-
-    all_dissolved = np.array(all_dissolved)
-    all_absorbed = np.array(all_absorbed)
+    if (isinstance(dissolved_fractions, np.ndarray)
+            and isinstance(absorbed_fractions, np.ndarray)
+            and dissolved_fractions.shape == absorbed_fractions.shape):
+        # Stacked (n_formulations, n_timepoints) arrays pool without a copy
+        all_dissolved = np.asarray(dissolved_fractions, dtype=float).ravel()
+        all_absorbed = np.asarray(absorbed_fractions, dtype=float).ravel()
+    else:
+        all_dissolved = []
+        all_absorbed = []
+
+        for diss, abso in zip(dissolved_fractions, absorbed_fractions):
+            diss = np.asarray(diss, dtype=float)
+            abso = np.asarray(abso, dtype=float)
+            # Use minimum length if mismatched
+            n = min(len(diss), len(abso))
+            all_dissolved.extend(diss[:n])
+            all_absorbed.extend(abso[:n])
+
+        all_dissolved = np.array(all_dissolved)
+        all_absorbed = np.array(all_absorbed)
 
     if len(all_dissolved) < 2:
         return {
@@ -50,14 +136,14 @@ def level_a_correlation(dissolved_fractions, absorbed_fractions):
             'all_absorbed': all_absorbed,
         }
 
-    slope, intercept, r_value, p_value, std_err = stats.linregress(
+    slope, intercept, r_squared, p_value, std_err = _fit_line(
         all_dissolved, all_absorbed
     )
 
     return {
         'slope': slope,
         'intercept': intercept,
-        'r_squared': r_value ** 2,
+        'r_squared': r_squared,
         'p_value': p_value,
         'std_err': std_err,
         'all_dissolved': all_dissolved,
@@ -65,6 +151,70 @@ def level_a_correlation(dissolved_fractions, absorbed_fractions):
     }
 
 
+def interpolation_matrix(x, xp):
+    """
+    Linear-interpolation weights from the grid xp onto the points x.
+
+    Row i holds the two weights that np.interp would apply to the samples
+    bracketing x[i], so W @ f equals np.interp(x, xp, f) for any f sampled
+    on xp. Values outside xp are clamped to the end points, as in np.interp.
+    The matrix depends only on the two grids and can be built once.
+
+    Parameters
+    ----------
+    x : array-like
+        Points at which to evaluate (e.g., dissolution timepoints).
+    xp : array-like
+        Increasing sample grid (e.g., PK timepoints).
+
+    Returns
+    -------
+    np.ndarray
+        Weight matrix, shape (len(x), len(xp)).
+    """
+    x = np.asarray(x, dtype=float)
+    xp = np.asarray(xp, dtype=float)
+
+    idx = np.clip(np.searchsorted(xp, x, side='right'), 1, len(xp) - 1)
+    x_lo = xp[idx - 1]
+    w = np.clip((x - x_lo) / (xp[idx] - x_lo), 0.0, 1.0)
+
+    weights = np.zeros((len(x), len(xp)))
+    rows = np.arange(len(x))
+    weights[rows, idx - 1] = 1.0 - w
+    weights[rows, idx] = w
+    return weights
+
+
+def interpolate_profiles(x, xp, fp, weights=None):
+    """
+    Linear interpolation of several profiles sampled on a shared grid.
+
+    Equivalent to calling np.interp(x, xp, row) for every row of fp, done
+    as one matrix product with the weights from interpolation_matrix.
+
+    Parameters
+    ----------
+    x : array-like
+        Points at which to evaluate (e.g., dissolution timepoints).
+    xp : array-like
+        Increasing sample grid shared by all profiles (e.g., PK timepoints).
+    fp : array-like
+        Profile values, shape (n_profiles, len(xp)).
+    weights : np.ndarray, optional
+        Precomputed interpolation_matrix(x, xp).
+
+    Returns
+    -------
+    np.ndarray
+        Interpolated values, shape (n_profiles, len(x)).
+    """
+    if weights is None:
+        weights = interpolation_matrix(x, xp)
+    fp = np.atleast_2d(np.asarray(fp, dtype=float))
+    return fp @ weights.T
+
+
 def level_c_correlation(in_vitro_values, in_vivo_values):
     """
     Level C IVIVC: Single-point correlation between one
@@ -93,12 +243,12 @@ def level_c_correlation(in_vitro_values, in_vivo_values):
             'in_vitro': x, 'in_vivo': y,
         }
 
-    slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+    slope, intercept, r_squared, p_value, std_err = _fit_line(x, y)
 
     return {
         'slope': slope,
         'intercept': intercept,
-        'r_squared': r_value ** 2,
+        'r_squared': r_squared,
         'p_value': p_value,
         'std_err': std_err,
         'in_vitro': x,
@@ -137,10 +287,10 @@ def compute_prediction_error(predicted, observed):
     predicted = np.atleast_1d(np.asarray(predicted, dtype=float))
     observed = np.atleast_1d(np.asarray(observed, dtype=float))
 
-    # Avoid division by zero
-    mask = observed != 0
-    pe = np.zeros_like(predicted)
-    pe[mask] = ((predicted[mask] - observed[mask]) / observed[mask]) * 100.0
+    # Avoid division by zero: %PE stays 0 where nothing was observed
+    pe = np.divide(predicted - observed, observed,
+                   out=np.zeros_like(predicted), where=observed != 0)
+    pe *= 100.0
 
     abs_pe = np.abs(pe)
     mean_abs_pe = float(np.mean(abs_pe))
@@ -181,22 +331,26 @@ def build_correlation_matrix(in_vitro_params, in_vivo_params,
         'p_value_matrix': 2D array,
         'iv_names': list, 'vivo_names': list
     """
-    n_iv = len(iv_names)
-    n_vivo = len(vivo_names)
-
-    r2_matrix = np.zeros((n_iv, n_vivo))
-    slope_matrix = np.zeros((n_iv, n_vivo))
-    p_matrix = np.zeros((n_iv, n_vivo))
-
-    for i, iv_name in enumerate(iv_names):
-        for j, vivo_name in enumerate(vivo_names):
-            result = level_c_correlation(
-                in_vitro_params[iv_name],
-                in_vivo_params[vivo_name]
-            )
-            r2_matrix[i, j] = result['r_squared']
-            slope_matrix[i, j] = result['slope']
-            p_matrix[i, j] = result['p_value']
+    # One row per parameter, one column per formulation
+    x = np.array([in_vitro_params[name] for name in iv_names], dtype=float)
+    y = np.array([in_vivo_params[name] for name in vivo_names], dtype=float)
+
+    if x.shape[-1] < 2:
+        shape = (len(iv_names), len(vivo_names))
+        r2_matrix = np.zeros(shape)
+        slope_matrix = np.zeros(shape)
+        p_matrix = np.ones(shape)
+    else:
+        x_mean = x.mean(axis=1)
+        y_mean = y.mean(axis=1)
+        dx = x - x_mean[:, None]
+        dy = y - y_mean[:, None]
+        # Every in vitro/in vivo cross-product comes from one matrix product
+        slope_matrix, _, r2_matrix, p_matrix, _ = _fit_from_sums(
+            x_mean[:, None], y_mean[None, :],
+            (dx * dx).sum(axis=1)[:, None], (dy * dy).sum(axis=1)[None, :],
+            dx @ dy.T, x.shape[1],
+        )
 
     return {
         'r_squared_matrix': r2_matrix,
@@ -0,0 +1,42 @@
+"""
+Shared page text for the Streamlit app: sidebar branding and disclaimer.
+
+Kept in one place so every page shows identical wording.
+
+All data is synthetic/hypothetical for educational purposes only.
+"""
+
+import streamlit as st
+
+SIDEBAR_MARKDOWN = """
+# 💊 IVIVC Framework
+
+**Interactive Decision Tool & Tutorial**
+
+Navigate using the pages above to:
+- 🏠 Learn about IVIVC
+- 🔍 Find your recommended level
+- 📈 Try Level A demo
+- 📊 Try Level B demo
+- 📉 Try Level C demo
+
+---
+*All data is synthetic/hypothetical.*
+"""
+
+DISCLAIMER = (
+    "**Disclaimer:** All data shown is synthetic/hypothetical, generated from "
+    "pharmacokinetic and dissolution mathematical models for educational "
+    "purposes only."
+)
+
+
+def render_sidebar():
+    """Sidebar branding block."""
+    st.sidebar.markdown(SIDEBAR_MARKDOWN)
+
+
+def render_disclaimer(extra=''):
+    """Horizontal rule followed by the standard disclaimer caption."""
+    st.markdown("---")
+    st.caption(f"{DISCLAIMER} {extra}".strip())
@@ -0,0 +1,192 @@
+"""
+IVIVC level recommendation logic for the Level Selector questionnaire.
+
+Scores each answer against a rule table and recommends Level A, B, or C.
+
+For educational purposes only — not a substitute for regulatory guidance.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# =============================================================================
+# Scoring Rules
+# =============================================================================
+
+# For each question, the first rule whose match text appears in the answer
+# applies: (match text, (ΔA, ΔB, ΔC), ((level, reason), ...), caveat or None).
+# An empty match text is a catch-all for the remaining options.
+SCORING_RULES = {
+    # ── Q1: Regulatory goal ──
+    "q1": (
+        ("Biowaiver", (4, 0, 0),
+         (("A", "Biowaiver applications strongly favor Level A (FDA guidance)"),),
+         None),
+        ("dissolution specifications", (2, 0, 2),
+         (("A", "Dissolution spec setting benefits from Level A"),
+          ("C", "Level C can support spec setting for individual parameters")),
+         None),
+        ("screening", (0, 0, 3),
+         (("C", "Formulation screening is the primary use case for Level C"),),
+         None),
+        ("Mechanistic", (2, 0, 2),
+         (("A", "Level A provides the most mechanistic detail"),
+          ("C", "Level C offers mechanistic insight for specific parameter pairs")),
+         None),
+    ),
+    # ── Q2: Data availability ──
+    "q2": (
+        ("Full plasma", (3, 0, 0),
+         (("A", "Full PK profiles enable deconvolution for Level A"),),
+         None),
+        ("Summary PK", (0, 2, 2),
+         (("B", "Summary parameters are sufficient for Level B (MDT vs MRT)"),
+          ("C", "Summary PK parameters are ideal for Level C correlations")),
+         "Without full PK profiles, Level A deconvolution is not feasible"),
+        ("Limited data", (0, 0, 3),
+         (("C", "Level C works with minimal data availability"),),
+         "Limited data restricts analysis to Level C only"),
+    ),
+    # ── Q3: Number of formulations ──
+    "q3": (
+        ("≥ 3", (2, 0, 1),
+         (("A", "≥3 formulations provide robust validation for Level A"),),
+         None),
+        ("2 formulations", (1, 0, 1), (),
+         "With only 2 formulations: Level A has limited internal validation; Level C gives trivial R²=1.00 (2 points always define a perfect line)"),
+        ("1 formulation", (1, 0, 1), (),
+         "Single formulation limits validation — external data needed for Level A; Level C requires ≥3 formulations for meaningful R²"),
+    ),
+    # ── Q4: Dosage form ──
+    "q4": (
+        ("oral", (2, 0, 0),
+         (("A", "Extended-release oral forms have the most established Level A methodology (FDA 1997 guidance)"),),
+         None),
+        ("Depot", (1, 0, 2),
+         (("C", "Depot injectables often use Level C due to complex absorption mechanisms"),),
+         "Depot formulations have multi-phasic absorption that complicates Level A deconvolution"),
+        ("Transdermal", (2, 0, 0),
+         (("A", "Transdermal systems can achieve Level A with appropriate deconvolution"),),
+         None),
+        ("", (1, 0, 1), (), None),
+    ),
+    # ── Q5: Reference data ──
+    "q5": (
+        ("IV bolus", (3, 0, 0),
+         (("A", "IV reference enables numerical deconvolution (most rigorous Level A approach)"),),
+         None),
+        ("IR/solution", (2, 0, 0),
+         (("A", "Oral IR data enables Wagner-Nelson deconvolution (assumes 1-compartment model)"),),
+         "Wagner-Nelson assumes 1-compartment PK — verify with appropriate model selection"),
+        ("No reference", (0, 1, 2),
+         (("C", "Level C does not require reference data"),),
+         "Without reference data, deconvolution (Level A) is not feasible"),
+    ),
+    # ── Q6: BCS class ──
+    "q6": (
+        ("Class I", (0, 0, 1), (),
+         "BCS Class I drugs (high sol/high perm) rarely need IVIVC — dissolution is usually not rate-limiting"),
+        ("Class II", (2, 0, 0),
+         (("A", "BCS Class II is the best candidate for IVIVC (dissolution is rate-limiting for absorption)"),),
+         None),
+        ("Class III", (0, 0, 1), (),
+         "BCS Class III (permeability-limited) makes IVIVC challenging — dissolution may not predict absorption"),
+        ("Class IV", (0, 0, 1), (),
+         "BCS Class IV drugs are the most challenging for IVIVC — both dissolution and permeability are limiting"),
+    ),
+}
+
+
+def _pack_scores(delta):
+    """Pack (ΔA, ΔB, ΔC) into one int with a 16-bit lane per level (A highest)."""
+    d_a, d_b, d_c = delta
+    return (d_a << 32) | (d_b << 16) | d_c
+
+
+# Rules with packed deltas, so each applied rule costs a single integer add
+_PACKED_RULES = {
+    key: tuple((needle, _pack_scores(delta), reasons, caveat)
+               for needle, delta, reasons, caveat in rules)
+    for key, rules in SCORING_RULES.items()
+}
+
+
+LEVELS = ('Level A', 'Level B', 'Level C')
+QUESTION_KEYS = ('q1', 'q2', 'q3', 'q4', 'q5', 'q6')
+
+
+# =============================================================================
+# Recommendation
+# =============================================================================
+
+@lru_cache(maxsize=4096)
+def compute_recommendation(answers):
+    """
+    Score questionnaire answers and recommend an IVIVC level.
+
+    The answer space is small and discrete, so results are memoized on the
+    answer tuple. Returned containers are shared between calls and must be
+    treated as read-only.
+
+    Parameters
+    ----------
+    answers : tuple of str
+        Selected option text for questions 1–6, in order.
+
+    Returns
+    -------
+    dict
+        'scores': {level: int},
+        'recommended': highest-scoring level,
+        'confidence': label ('🟢 Strong', '🟡 Moderate', '🔴 Weak'),
+        'confidence_pct': recommended score as % of total,
+        'reasons': {level: tuple of str},
+        'caveats': tuple of str,
+        'ranking': levels ordered by descending score
+    """
+    answers = dict(zip(QUESTION_KEYS, answers))
+
+    # Apply the first matching rule for each question
+    packed = 0
+    reasons_by_level = {'A': [], 'B': [], 'C': []}
+    caveats = []
+    for key, rules in _PACKED_RULES.items():
+        for needle, delta, rule_reasons, caveat in rules:
+            if needle in answers[key]:
+                packed += delta
+                for level, reason in rule_reasons:
+                    reasons_by_level[level].append(reason)
+                if caveat:
+                    caveats.append(caveat)
+                break
+
+    values = np.array([(packed >> 32) & 0xFFFF, (packed >> 16) & 0xFFFF,
+                       packed & 0xFFFF])
+    best = int(values.argmax())  # first level wins ties
+    recommended = LEVELS[best]
+
+    # Confidence
+    total = int(values.sum())
+    if total > 0:
+        confidence_pct = float(values[best] / total) * 100
+    else:
+        confidence_pct = 33
+
+    if confidence_pct >= 55:
+        confidence = "🟢 Strong"
+    elif confidence_pct >= 40:
+        confidence = "🟡 Moderate"
+    else:
+        confidence = "🔴 Weak"
+
+    return {
+        'scores': dict(zip(LEVELS, values.tolist())),
+        'recommended': recommended,
+        'confidence': confidence,
+        'confidence_pct': confidence_pct,
+        'reasons': {level: tuple(reasons_by_level[level[-1]]) for level in LEVELS},
+        'caveats': tuple(caveats),
+        # Stable sort keeps A → B → C order among tied scores
+        'ranking': tuple(LEVELS[i] for i in np.argsort(-values, kind='stable')),
+    }
@@ -5,10 +5,14 @@ All data is synthetic/hypothetical for educational purposes only.
 """
 
 import numpy as np
+from scipy.fft import next_fast_len
 
 # NumPy 2.0 removed np.trapz → np.trapezoid
 _trapz = getattr(np, 'trapezoid', None) or np.trapz
 
+# Below this many points direct convolution is faster than going through FFTs
+_FFT_CONVOLVE_MIN = 64
+
 
 def one_compartment_oral(t, dose, ka, ke, vd):
     """
@@ -19,11 +23,12 @@ def one_compartment_oral(t, dose, ka, ke, vd):
     Parameters
     ----------
     t : array-like
-        Time points (hours).
+        Time points (hours). float32 input gives a float32 result.
     dose : float
         Dose (mg).
-    ka : float
-        Absorption rate constant (h⁻¹).
+    ka : float or array-like
+        Absorption rate constant (h⁻¹). An array is broadcast against t,
+        e.g. ka[:, None] gives one profile per row.
     ke : float
         Elimination rate constant (h⁻¹).
     vd : float
@@ -34,13 +39,28 @@ def one_compartment_oral(t, dose, ka, ke, vd):
     np.ndarray
         Plasma concentration at each time point.
     """
-    t = np.asarray(t, dtype=float)
-    if abs(ka - ke) < 1e-10:
-        # Limiting case: ka ≈ ke
-        return (dose / vd) * ka * t * np.exp(-ke * t)
-
-    coeff = (dose * ka) / (vd * (ka - ke))
-    return coeff * (np.exp(-ke * t) - np.exp(-ka * t))
+    t = np.asarray(t)
+    if t.dtype != np.float32:  # float32 input is evaluated in float32
+        t = t.astype(float, copy=False)
+    if np.ndim(ka) == 0:
+        if abs(ka - ke) < 1e-10:
+            # Limiting case: ka ≈ ke
+            return (dose / vd) * ka * t * np.exp(-ke * t)
+
+        coeff = (dose * ka) / (vd * (ka - ke))
+        conc = np.exp(-ke * t)
+        conc -= np.exp(-ka * t)
+        conc *= coeff
+        return conc
+
+    # Several absorption rates evaluated in one broadcast
+    ka = np.asarray(ka, dtype=t.dtype)
+    limiting = np.abs(ka - ke) < 1e-10
+    coeff = (dose * ka) / (vd * np.where(limiting, 1.0, ka - ke))
+    conc = coeff * (np.exp(-ke * t) - np.exp(-ka * t))
+    if limiting.any():
+        conc = np.where(limiting, (dose / vd) * ka * t * np.exp(-ke * t), conc)
+    return conc
 
 
 def impulse_response_1comp(t, ke, vd):
@@ -64,7 +84,9 @@ def impulse_response_1comp(t, ke, vd):
         Impulse response at each time point.
     """
     t = np.asarray(t, dtype=float)
-    return (1.0 / vd) * np.exp(-ke * t)
+    h = np.exp(-ke * t)
+    h *= 1.0 / vd
+    return h
 
 
 def convolve_dissolution_pk(times, dissolution_rate, impulse_resp):
@@ -86,13 +108,66 @@ def convolve_dissolution_pk(times, dissolution_rate, impulse_resp):
     -------
     np.ndarray
         Predicted plasma concentration profile.
+
+    Notes
+    -----
+    Long profiles are convolved via real FFTs (O(N log N)) rather than
+    directly (O(N²)); the two agree to rounding error. To convolve many
+    rates with the same impulse response, use ConvolvePK.
     """
     times = np.asarray(times, dtype=float)
     dt = times[1] - times[0] if len(times) > 1 else 1.0
+    n = len(times)
+
+    # Only the first N points of the convolution are kept, and they depend
+    # only on the first N points of each input
+    rate = np.asarray(dissolution_rate, dtype=float)[:n]
+    h = np.asarray(impulse_resp, dtype=float)[:n]
+
+    if min(len(rate), len(h)) < _FFT_CONVOLVE_MIN:
+        conv = np.convolve(rate, h)
+    else:
+        # Real-input FFTs, zero-padded to a fast length covering the full
+        # linear convolution so nothing wraps around
+        n_full = len(rate) + len(h) - 1
+        nfft = next_fast_len(n_full, real=True)
+        conv = np.fft.irfft(np.fft.rfft(rate, nfft) * np.fft.rfft(h, nfft), nfft)[:n_full]
+    return conv[:n] * dt
+
+
+class ConvolvePK:
+    """
+    Convolution of dissolution rates with one fixed PK impulse response.
+
+    The transform of the impulse response is computed once, so convolving
+    several formulations (or a 2D array of rates, one per row) against the
+    same h(t) only pays for the forward transform of each rate. Results
+    match convolve_dissolution_pk to rounding error.
+
+    Parameters
+    ----------
+    times : array-like
+        Evenly-spaced time points (hours).
+    impulse_resp : array-like
+        PK impulse response h(t) on the same grid.
+    """
+
+    def __init__(self, times, impulse_resp):
+        times = np.asarray(times, dtype=float)
+        self.n = len(times)
+        self.dt = times[1] - times[0] if self.n > 1 else 1.0
 
-    # Full convolution, take only first N points
-    conv = np.convolve(dissolution_rate, impulse_resp) * dt
-    return conv[:len(times)]
+        # Zero-padded far enough that the first N points are free of
+        # circular wrap-around
+        self.nfft = next_fast_len(2 * self.n - 1, real=True)
+        h = np.asarray(impulse_resp, dtype=float)[:self.n]
+        self._h_fft = np.fft.rfft(h, self.nfft)
+
+    def __call__(self, dissolution_rate):
+        """Predicted plasma concentration for each dissolution rate profile."""
+        rate = np.asarray(dissolution_rate, dtype=float)[..., :self.n]
+        conv = np.fft.irfft(np.fft.rfft(rate, self.nfft) * self._h_fft, self.nfft)
+        return conv[..., :self.n] * self.dt
 
 
 def biexponential_depot(t, a1, alpha1, ka, a2, alpha2):
@@ -105,24 +180,42 @@ def biexponential_depot(t, a1, alpha1, ka, a2, alpha2):
     ----------
     t : array-like
         Time points (hours).
-    a1 : float
+    a1 : float or array-like
         Coefficient for absorption-elimination phase.
-    alpha1 : float
+    alpha1 : float or array-like
         Disposition rate constant (h⁻¹).
-    ka : float
+    ka : float or array-like
         Absorption rate constant (h⁻¹).
-    a2 : float
+    a2 : float or array-like
         Coefficient for sustained phase.
-    alpha2 : float
+    alpha2 : float or array-like
         Terminal elimination rate constant (h⁻¹).
 
+    Parameters given as arrays are broadcast against t, e.g. columns of
+    shape (n, 1) give one profile per row.
+
     Returns
     -------
     np.ndarray
         Plasma concentration at each time point.
     """
     t = np.asarray(t, dtype=float)
-    return a1 * np.exp(-alpha1 * t) * (1.0 - np.exp(-ka * t)) + a2 * np.exp(-alpha2 * t)
+    # Both phases are evaluated in place; expm1(-ka·t) = -(1 - exp(-ka·t)).
+    # The phase buffers take the shape t broadcasts to with every parameter,
+    # so each coefficient can be folded in whatever its own shape.
+    shape = np.broadcast_shapes(t.shape, *map(np.shape, (a1, alpha1, ka, a2, alpha2)))
+    conc = np.multiply(t, -alpha1, out=np.empty(shape))
+    np.exp(conc, out=conc)
+    absorbed = np.asarray(np.multiply(t, -ka))
+    np.expm1(absorbed, out=absorbed)
+    conc *= absorbed
+    conc *= -a1
+
+    terminal = np.multiply(t, -alpha2, out=np.empty(shape))
+    np.exp(terminal, out=terminal)
+    terminal *= a2
+    conc += terminal
+    return conc[()]  # scalar t still gives a scalar
 
 
 def compute_auc(times, conc):
@@ -134,14 +227,74 @@ def compute_auc(times, conc):
     times : array-like
         Time points.
     conc : array-like
-        Concentration values.
+        Concentration values. A 2D array is integrated row by row.
 
     Returns
     -------
-    float
-        Area under the curve.
+    float or np.ndarray
+        Area under the curve (one value per row for 2D input).
+    """
+    auc = _trapz(conc, times)
+    return float(auc) if np.ndim(auc) == 0 else auc
+
+
+def compute_auc_cumulative(times, conc):
+    """
+    Cumulative AUC(0,t) using the trapezoidal rule.
+
+    Parameters
+    ----------
+    times : array-like
+        Time points.
+    conc : array-like
+        Concentration values. Leading dimensions are treated as separate
+        profiles, integrated along the last axis.
+
+    Returns
+    -------
+    np.ndarray
+        AUC(0,t) at each time point (0 at the first), same shape as conc;
+        the last element along the time axis is the total AUC.
+    """
+    times = np.asarray(times, dtype=float)
+    conc = np.asarray(conc, dtype=float)
+    trapezoids = 0.5 * (conc[..., :-1] + conc[..., 1:]) * np.diff(times)
+    auc_cumulative = np.empty_like(conc)
+    auc_cumulative[..., 0] = 0.0
+    np.cumsum(trapezoids, axis=-1, out=auc_cumulative[..., 1:])
+    return auc_cumulative
+
+
+def compute_exposure(times, conc):
+    """
+    Peak and total exposure of a concentration profile.
+
+    Cmax and Tmax are both read from a single argmax over the profile
+    (rather than separate max and argmax passes), and AUC uses the
+    trapezoidal rule as in compute_auc.
+
+    Parameters
+    ----------
+    times : array-like
+        Time points.
+    conc : array-like
+        Concentration values. A 2D array is treated row by row.
+
+    Returns
+    -------
+    dict
+        'Cmax', 'Tmax', 'AUC' (floats, or one value per row for 2D input)
     """
-    return float(_trapz(conc, times))
+    times = np.asarray(times)
+    conc = np.asarray(conc)
+    peak = np.argmax(conc, axis=-1)
+    cmax = np.take_along_axis(conc, np.expand_dims(peak, -1), axis=-1)[..., 0]
+    tmax = times[peak]
+    auc = _trapz(conc, times)
+
+    if conc.ndim == 1:
+        return {'Cmax': float(cmax), 'Tmax': float(tmax), 'AUC': float(auc)}
+    return {'Cmax': cmax, 'Tmax': tmax, 'AUC': auc}
 
 
 def compute_aumc(times, conc):
@@ -167,6 +320,19 @@ def compute_aumc(times, conc):
     return float(_trapz(times * conc, times))
 
 
+def _auc_aumc(times, conc):
+    """
+    AUC and AUMC from one trapezoidal pass over C(t) and t·C(t)
+    (floats, or one value per row for 2D conc).
+    """
+    times = np.asarray(times, dtype=float)
+    conc = np.asarray(conc, dtype=float)
+    auc, aumc = _trapz(np.stack((conc, times * conc)), times)
+    if conc.ndim == 1:
+        return float(auc), float(aumc)
+    return auc, aumc
+
+
 def compute_mrt(times, conc):
     """
     Compute Mean Residence Time.
@@ -178,15 +344,17 @@ def compute_mrt(times, conc):
     times : array-like
         Time points.
     conc : array-like
-        Concentration values.
+        Concentration values. A 2D array is treated row by row.
 
     Returns
     -------
-    float
-        Mean residence time.
+    float or np.ndarray
+        Mean residence time (one value per row for 2D input).
     """
-    auc = compute_auc(times, conc)
-    aumc = compute_aumc(times, conc)
+    auc, aumc = _auc_aumc(times, conc)
+
+    if np.ndim(auc):
+        return np.divide(aumc, auc, out=np.zeros_like(auc), where=auc != 0)
 
     if auc == 0:
         return 0.0
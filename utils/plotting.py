@@ -3,9 +3,18 @@ Shared plotting utilities using Plotly for interactive Streamlit figures.
 
 Consistent color palette and styling across all pages.
 
+Every plot_* function returns a go.Figure for st.plotly_chart, which ships
+it to the browser as JSON and renders it client-side with plotly.js.
+Nothing here exports static images (fig.to_image / fig.write_image), so
+the app never starts Kaleido or fetches plotly.js for server-side renders;
+keep it that way when adding plots.
+
 All data is synthetic/hypothetical for educational purposes only.
 """
 
+import copy
+from functools import lru_cache
+
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
@@ -51,43 +60,152 @@ LAYOUT_DEFAULTS = dict(
 
 
 def _base_layout(**kwargs):
-    """Merge default layout with custom kwargs."""
-    layout = {**LAYOUT_DEFAULTS}
-    layout.update(kwargs)
-    return layout
+    """
+    Merge default layout with custom kwargs.
+
+    Only the top level is copied; the nested defaults (font, margin, legend)
+    are shared with LAYOUT_DEFAULTS, which Plotly copies when it validates
+    them, so callers must not mutate them in place.
+    """
+    return {**LAYOUT_DEFAULTS, **kwargs}
+
+
+# The house style validated once at import. Figures are created on top of it
+# (go.Figure(layout=_BASE_LAYOUT), or make_subplots(figure=...)) and then only
+# set their own title and axes, instead of re-validating LAYOUT_DEFAULTS on
+# every call. It is deliberately not a plotly.io template: st.plotly_chart's
+# default theme overwrites a template's font, legend, margins and
+# backgrounds, whereas values on the figure's own layout win.
+_BASE_LAYOUT = go.Layout(**LAYOUT_DEFAULTS)
+
+
+def _linregress(x, y):
+    """
+    Least-squares line through (x, y) using NumPy only.
+
+    Returns
+    -------
+    tuple
+        (slope, intercept, r_squared)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_mean, y_mean = x.mean(), y.mean()
+    dx, dy = x - x_mean, y - y_mean
+    ss_xx, ss_yy, ss_xy = dx @ dx, dy @ dy, dx @ dy
+
+    slope = ss_xy / ss_xx
+    intercept = y_mean - slope * x_mean
+    r_squared = ss_xy ** 2 / (ss_xx * ss_yy) if ss_yy > 0 else 0.0
+    return slope, intercept, r_squared
+
+
+# Curves with at least this many points are drawn with WebGL (Scattergl),
+# whose cost barely grows with the point count; shorter ones stay SVG,
+# where the per-plot WebGL setup would cost more than it saves
+WEBGL_MIN_POINTS = 100
+
+
+def _line_trace_type(n_points):
+    """go.Scattergl for long curves, go.Scatter for short ones."""
+    return go.Scattergl if n_points >= WEBGL_MIN_POINTS else go.Scatter
+
+
+# Profiles longer than this are decimated before plotting
+DOWNSAMPLE_THRESHOLD = 300
+DOWNSAMPLE_POINTS = 200
+
+
+def _minmax_indices(y, n_out):
+    """
+    Indices of about n_out points of y that keep its visual shape.
+
+    The interior is split into equal buckets and each bucket keeps its
+    minimum and maximum, so peaks (Cmax/Tmax) survive; the end points are
+    always kept. Unlike LTTB, every bucket is independent, so the whole
+    selection is a couple of array reductions.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    inner = y[1:-1]
+    size = -(-len(inner) // max((n_out - 2) // 2, 1))  # ceil division
+    n_buckets = -(-len(inner) // size)
+
+    buckets = np.full(n_buckets * size, np.nan)
+    buckets[:len(inner)] = inner
+    buckets = buckets.reshape(n_buckets, size)
+    offsets = 1 + size * np.arange(n_buckets)
+
+    return np.unique(np.concatenate((
+        [0],
+        offsets + np.nanargmin(buckets, axis=1),
+        offsets + np.nanargmax(buckets, axis=1),
+        [n - 1],
+    )))
+
+
+def _decimate(times, values):
+    """Downsample a long (times, values) curve; short curves pass through."""
+    if len(times) <= DOWNSAMPLE_THRESHOLD:
+        return times, values
+    idx = _minmax_indices(values, DOWNSAMPLE_POINTS)
+    return np.asarray(times)[idx], np.asarray(values)[idx]
 
 
 # =============================================================================
 # Level A Plots
 # =============================================================================
 
-def plot_dissolution_profiles(times, profiles, ir_profile=None,
-                              title='In Vitro Dissolution Profiles',
-                              x_label='Time (h)', y_label='Cumulative % Released'):
-    """Plot dissolution curves for multiple formulations."""
-    fig = go.Figure()
-
-    for name, release in profiles.items():
-        color = COLORS.get(name, '#666')
-        fig.add_trace(go.Scatter(
-            x=times, y=release,
+def _profile_traces(times, profiles, reference=None, names=None):
+    """
+    Line+marker traces for one curve per formulation plus an optional IR
+    reference, built together so the figure is constructed in one call.
+
+    profiles is either a {name: curve} dict or, with names, a 2D array
+    holding one curve per row in names order.
+
+    Each curve keeps its own trace: a Plotly line has a single colour, so
+    curves can only share a trace if they share a style and legend entry.
+    Long curves are decimated to about DOWNSAMPLE_POINTS points.
+    """
+    scatter = _line_trace_type(len(times))
+    traces = []
+    curves = profiles.items() if names is None else zip(names, profiles)
+    for name, values in curves:
+        x, y = _decimate(times, values)
+        traces.append(scatter(
+            x=x, y=y,
             mode='lines+markers',
             name=name,
-            line=dict(color=color, width=2.5),
+            line=dict(color=COLORS.get(name, '#666'), width=2.5),
             marker=dict(size=6),
         ))
 
-    if ir_profile is not None:
-        fig.add_trace(go.Scatter(
-            x=times, y=ir_profile,
+    if reference is not None:
+        x, y = _decimate(times, reference)
+        traces.append(scatter(
+            x=x, y=y,
             mode='lines+markers',
             name='IR Reference',
             line=dict(color=COLORS['IR Reference'], width=2, dash='dash'),
             marker=dict(size=5, symbol='diamond'),
         ))
+    return traces
+
+
+def plot_dissolution_profiles(times, profiles, ir_profile=None,
+                              title='In Vitro Dissolution Profiles',
+                              x_label='Time (h)', y_label='Cumulative % Released',
+                              names=None):
+    """
+    Plot dissolution curves for multiple formulations, given as a
+    {name: curve} dict or as a 2D array with one row per name in names.
+    """
+    fig = go.Figure(data=_profile_traces(times, profiles, ir_profile, names),
+                    layout=_BASE_LAYOUT)
 
     fig.update_layout(
-        **_base_layout(title=title),
+        title=title,
         xaxis=dict(title=x_label, gridcolor='#eee', zeroline=False),
         yaxis=dict(title=y_label, gridcolor='#eee', range=[0, 105], zeroline=False),
     )
@@ -96,83 +214,93 @@ def plot_dissolution_profiles(times, profiles, ir_profile=None,
 
 def plot_pk_profiles(times, profiles, title='Plasma Concentration-Time Profiles',
                      x_label='Time (h)', y_label='Concentration (mg/L)',
-                     ir_pk=None):
-    """Plot PK curves for multiple formulations."""
-    fig = go.Figure()
-
-    for name, conc in profiles.items():
-        color = COLORS.get(name, '#666')
-        fig.add_trace(go.Scatter(
-            x=times, y=conc,
-            mode='lines+markers',
-            name=name,
-            line=dict(color=color, width=2.5),
-            marker=dict(size=6),
-        ))
-
-    if ir_pk is not None:
-        fig.add_trace(go.Scatter(
-            x=times, y=ir_pk,
-            mode='lines+markers',
-            name='IR Reference',
-            line=dict(color=COLORS['IR Reference'], width=2, dash='dash'),
-            marker=dict(size=5, symbol='diamond'),
-        ))
+                     ir_pk=None, names=None):
+    """
+    Plot PK curves for multiple formulations, given as a {name: curve}
+    dict or as a 2D array with one row per name in names.
+    """
+    fig = go.Figure(data=_profile_traces(times, profiles, ir_pk, names),
+                    layout=_BASE_LAYOUT)
 
     fig.update_layout(
-        **_base_layout(title=title),
+        title=title,
         xaxis=dict(title=x_label, gridcolor='#eee', zeroline=False),
         yaxis=dict(title=y_label, gridcolor='#eee', zeroline=False),
     )
     return fig
 
 
-def plot_absorption_vs_dissolution(times_diss, dissolution, times_abs, absorption,
-                                    name='Formulation',
-                                    color='#2196F3'):
-    """Overlay in vitro dissolution vs in vivo fraction absorbed."""
-    fig = go.Figure()
+@lru_cache(maxsize=1)
+def _absorption_vs_dissolution_spec():
+    """
+    Validated figure spec for plot_absorption_vs_dissolution without data.
+
+    Built once; each call deep-copies this small dict, fills in the traces,
+    and skips Plotly's per-property validation (already done here).
+    """
+    fig = go.Figure(layout=_BASE_LAYOUT)
 
     fig.add_trace(go.Scatter(
-        x=times_diss, y=dissolution,
         mode='lines+markers',
         name='% Dissolved (in vitro)',
-        line=dict(color=color, width=2.5),
+        line=dict(width=2.5),
         marker=dict(size=6),
     ))
 
     fig.add_trace(go.Scatter(
-        x=times_abs, y=absorption * 100,
         mode='lines+markers',
         name='% Absorbed (in vivo)',
-        line=dict(color=color, width=2.5, dash='dash'),
+        line=dict(width=2.5, dash='dash'),
         marker=dict(size=6, symbol='x'),
     ))
 
     fig.update_layout(
-        **_base_layout(title=f'{name}: Dissolution vs Absorption'),
+        title='',
         xaxis=dict(title='Time (h)', gridcolor='#eee', zeroline=False),
         yaxis=dict(title='%', gridcolor='#eee', range=[0, 105], zeroline=False),
     )
-    return fig
+
+    spec = fig.to_dict()
+    # The default template is re-applied when the figure is constructed
+    spec['layout'].pop('template', None)
+    return spec
+
+
+def plot_absorption_vs_dissolution(times_diss, dissolution, times_abs, absorption,
+                                    name='Formulation',
+                                    color='#2196F3'):
+    """Overlay in vitro dissolution vs in vivo fraction absorbed."""
+    spec = copy.deepcopy(_absorption_vs_dissolution_spec())
+    diss_trace, abs_trace = spec['data']
+
+    diss_trace.update(x=times_diss, y=dissolution)
+    diss_trace['line']['color'] = color
+    abs_trace.update(x=times_abs, y=np.asarray(absorption) * 100)
+    abs_trace['line']['color'] = color
+    for trace in (diss_trace, abs_trace):
+        if _line_trace_type(len(trace['x'])) is go.Scattergl:
+            trace['type'] = 'scattergl'
+    spec['layout']['title']['text'] = f'{name}: Dissolution vs Absorption'
+
+    return go.Figure(spec, _validate=False)
 
 
 def plot_level_a_correlation(all_dissolved, all_absorbed, slope, intercept,
                               r_squared, title='Level A Correlation'):
     """Scatter plot of % dissolved vs % absorbed with regression line."""
-    fig = go.Figure()
+    traces = []
 
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=all_dissolved, y=all_absorbed,
         mode='markers',
         name='Data',
         marker=dict(size=8, color=COLORS['primary'], opacity=0.7),
     ))
 
-    # Regression line
-    x_fit = np.linspace(0, 100, 100)
-    y_fit = slope * x_fit + intercept
-    fig.add_trace(go.Scatter(
+    # Regression line (straight, so its two endpoints are enough)
+    x_fit = [0.0, 100.0]
+    y_fit = [intercept, slope * 100.0 + intercept]
+    traces.append(go.Scatter(
         x=x_fit, y=y_fit,
         mode='lines',
         name=f'y = {slope:.3f}x + {intercept:.2f}',
@@ -180,15 +308,16 @@ def plot_level_a_correlation(all_dissolved, all_absorbed, slope, intercept,
     ))
 
     # 1:1 line
-    fig.add_trace(go.Scatter(
+    traces.append(go.Scatter(
         x=[0, 100], y=[0, 100],
         mode='lines',
         name='1:1 Line (ideal)',
         line=dict(color='#ccc', width=1.5, dash='dot'),
     ))
 
+    fig = go.Figure(data=traces, layout=_BASE_LAYOUT)
     fig.update_layout(
-        **_base_layout(title=f'{title} (R² = {r_squared:.4f})'),
+        title=f'{title} (R² = {r_squared:.4f})',
         xaxis=dict(title='% Dissolved (in vitro)', gridcolor='#eee',
                    range=[0, 105], zeroline=False),
         yaxis=dict(title='% Absorbed (in vivo)', gridcolor='#eee',
@@ -199,27 +328,29 @@ def plot_level_a_correlation(all_dissolved, all_absorbed, slope, intercept,
 
 def plot_pe_validation(formulation_names, pe_cmax, pe_auc):
     """Bar chart of %PE for each formulation (Cmax and AUC)."""
-    fig = make_subplots(rows=1, cols=2, subplot_titles=['Cmax %PE', 'AUC %PE'])
+    fig = make_subplots(rows=1, cols=2, subplot_titles=['Cmax %PE', 'AUC %PE'],
+                        figure=go.Figure(layout=_BASE_LAYOUT))
 
     # Cmax
     colors_cmax = [COLORS['success'] if abs(v) <= 15 else COLORS['danger']
                    for v in pe_cmax]
-    fig.add_trace(go.Bar(
+    cmax_bars = go.Bar(
         x=formulation_names, y=pe_cmax,
         marker_color=colors_cmax,
         name='Cmax %PE',
         showlegend=False,
-    ), row=1, col=1)
+    )
 
     # AUC
     colors_auc = [COLORS['success'] if abs(v) <= 15 else COLORS['danger']
                   for v in pe_auc]
-    fig.add_trace(go.Bar(
+    auc_bars = go.Bar(
         x=formulation_names, y=pe_auc,
         marker_color=colors_auc,
         name='AUC %PE',
         showlegend=False,
-    ), row=1, col=2)
+    )
+    fig.add_traces([cmax_bars, auc_bars], rows=[1, 1], cols=[1, 2])
 
     # Threshold lines
     for col in [1, 2]:
@@ -230,7 +361,7 @@ def plot_pe_validation(formulation_names, pe_cmax, pe_auc):
                       annotation_text='±10% (mean)', row=1, col=col)
         fig.add_hline(y=-10, line_dash='dot', line_color='orange', row=1, col=col)
 
-    fig.update_layout(**_base_layout(title='Internal Validation: %Prediction Error'))
+    fig.update_layout(title='Internal Validation: %Prediction Error')
     return fig
 
 
@@ -240,11 +371,11 @@ def plot_pe_validation(formulation_names, pe_cmax, pe_auc):
 
 def plot_mdt_vs_mrt(formulation_names, mdt_values, mrt_values):
     """Scatter plot of MDT vs MRT for Level B."""
-    fig = go.Figure()
+    traces = []
 
     for name in formulation_names:
         color = COLORS.get(name, '#666')
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
             x=[mdt_values[name]],
             y=[mrt_values[name]],
             mode='markers+text',
@@ -258,20 +389,20 @@ def plot_mdt_vs_mrt(formulation_names, mdt_values, mrt_values):
     x_vals = np.array([mdt_values[n] for n in formulation_names])
     y_vals = np.array([mrt_values[n] for n in formulation_names])
 
-    if len(x_vals) >= 2:
-        from scipy import stats
-        slope, intercept, r, p, se = stats.linregress(x_vals, y_vals)
-        x_fit = np.linspace(x_vals.min() * 0.8, x_vals.max() * 1.2, 50)
-        y_fit = slope * x_fit + intercept
-        fig.add_trace(go.Scatter(
+    if len(x_vals) >= 2 and np.ptp(x_vals) > 0:
+        slope, intercept, r_squared = _linregress(x_vals, y_vals)
+        x_fit = [x_vals.min() * 0.8, x_vals.max() * 1.2]
+        y_fit = [slope * x + intercept for x in x_fit]
+        traces.append(go.Scatter(
             x=x_fit, y=y_fit,
             mode='lines',
-            name=f'R² = {r**2:.3f}',
+            name=f'R² = {r_squared:.3f}',
             line=dict(color='gray', dash='dash', width=1.5),
         ))
 
+    fig = go.Figure(data=traces, layout=_BASE_LAYOUT)
     fig.update_layout(
-        **_base_layout(title='Level B: MDT vs MRT'),
+        title='Level B: MDT vs MRT',
         xaxis=dict(title='MDT — Mean Dissolution Time (h)', gridcolor='#eee', zeroline=False),
         yaxis=dict(title='MRT — Mean Residence Time (h)', gridcolor='#eee', zeroline=False),
     )
@@ -281,35 +412,35 @@ def plot_mdt_vs_mrt(formulation_names, mdt_values, mrt_values):
 def plot_pathological_example(data):
     """Show two formulations with same MDT but different profiles."""
     fig = make_subplots(rows=1, cols=2,
-                        subplot_titles=['Dissolution Profiles', 'PK Profiles'])
+                        subplot_titles=['Dissolution Profiles', 'PK Profiles'],
+                        figure=go.Figure(layout=_BASE_LAYOUT))
+    scatter = _line_trace_type(len(data['times']))
 
     # Dissolution
-    fig.add_trace(go.Scatter(
+    traces = [scatter(
         x=data['times'], y=data['P1_dissolution'],
         name=f"P1 (biphasic, MDT={data['MDT_P1']:.1f}h)",
         line=dict(color=COLORS['P1'], width=2.5),
-    ), row=1, col=1)
-
-    fig.add_trace(go.Scatter(
+    ), scatter(
         x=data['times'], y=data['P2_dissolution'],
         name=f"P2 (steady, MDT={data['MDT_P2']:.1f}h)",
         line=dict(color=COLORS['P2'], width=2.5),
-    ), row=1, col=1)
+    )]
 
     # PK
-    fig.add_trace(go.Scatter(
+    traces += [scatter(
         x=data['times'], y=data['P1_pk'],
         name=f"P1 (MRT={data['MRT_P1']:.1f}h)",
         line=dict(color=COLORS['P1'], width=2.5, dash='dash'),
         showlegend=False,
-    ), row=1, col=2)
-
-    fig.add_trace(go.Scatter(
+    ), scatter(
         x=data['times'], y=data['P2_pk'],
         name=f"P2 (MRT={data['MRT_P2']:.1f}h)",
         line=dict(color=COLORS['P2'], width=2.5, dash='dash'),
         showlegend=False,
-    ), row=1, col=2)
+    )]
+
+    fig.add_traces(traces, rows=[1, 1, 1, 1], cols=[1, 1, 2, 2])
 
     fig.update_xaxes(title_text='Time (h)', gridcolor='#eee', row=1, col=1)
     fig.update_xaxes(title_text='Time (h)', gridcolor='#eee', row=1, col=2)
@@ -317,7 +448,7 @@ def plot_pathological_example(data):
     fig.update_yaxes(title_text='Concentration (mg/L)', gridcolor='#eee', row=1, col=2)
 
     fig.update_layout(
-        **_base_layout(title='Limitation: Same MDT ≠ Same PK'),
+        title='Limitation: Same MDT ≠ Same PK',
         height=400,
     )
     return fig
@@ -327,52 +458,79 @@ def plot_pathological_example(data):
 # Level C Plots
 # =============================================================================
 
-def plot_level_c_scatter(in_vitro, in_vivo, iv_name, vivo_name,
-                          formulation_names, slope, intercept, r_squared):
-    """Level C scatter plot for one parameter pair."""
-    fig = go.Figure()
+@lru_cache(maxsize=1)
+def _level_c_scatter_spec():
+    """
+    Validated trace and layout templates for plot_level_c_scatter.
 
-    for i, name in enumerate(formulation_names):
-        color = COLORS.get(name, '#666')
-        fig.add_trace(go.Scatter(
-            x=[in_vitro[i]], y=[in_vivo[i]],
-            mode='markers+text',
-            name=name,
-            text=[name.split(' ')[0]],
-            textposition='top center',
-            marker=dict(size=14, color=color),
-        ))
+    The scatter is rebuilt whenever the parameter pair changes, so (as for
+    plot_absorption_vs_dissolution) it is assembled from copies of these
+    templates without re-running Plotly's validation.
+    """
+    fig = go.Figure(layout=_BASE_LAYOUT)
+
+    # One marker trace per formulation
+    fig.add_trace(go.Scatter(
+        mode='markers+text',
+        textposition='top center',
+        marker=dict(size=14),
+    ))
 
     # Regression
-    x_range = np.linspace(min(in_vitro) * 0.8, max(in_vitro) * 1.2, 50)
-    y_fit = slope * x_range + intercept
     fig.add_trace(go.Scatter(
-        x=x_range, y=y_fit,
         mode='lines',
-        name=f'Fit (R²={r_squared:.3f})',
         line=dict(color='gray', dash='dash', width=1.5),
     ))
 
-    slope_dir = '↑' if slope > 0 else '↓'
     fig.update_layout(
-        **_base_layout(title=f'{iv_name} vs {vivo_name} — R²={r_squared:.3f} {slope_dir}'),
-        xaxis=dict(title=iv_name, gridcolor='#eee', zeroline=False),
-        yaxis=dict(title=vivo_name, gridcolor='#eee', zeroline=False),
+        title='',
+        xaxis=dict(title='', gridcolor='#eee', zeroline=False),
+        yaxis=dict(title='', gridcolor='#eee', zeroline=False),
         showlegend=True,
     )
-    return fig
+
+    spec = fig.to_dict()
+    # The default template is re-applied when the figure is constructed
+    spec['layout'].pop('template', None)
+    return spec
+
+
+def plot_level_c_scatter(in_vitro, in_vivo, iv_name, vivo_name,
+                          formulation_names, slope, intercept, r_squared):
+    """Level C scatter plot for one parameter pair."""
+    spec = _level_c_scatter_spec()
+    point_template, fit_template = spec['data']
+
+    traces = []
+    for i, name in enumerate(formulation_names):
+        point = copy.deepcopy(point_template)
+        point.update(x=[in_vitro[i]], y=[in_vivo[i]], name=name,
+                     text=[name.split(' ')[0]])
+        point['marker']['color'] = COLORS.get(name, '#666')
+        traces.append(point)
+
+    # Regression line, drawn from its two endpoints
+    x_range = [float(min(in_vitro)) * 0.8, float(max(in_vitro)) * 1.2]
+    y_fit = [slope * x + intercept for x in x_range]
+    fit = copy.deepcopy(fit_template)
+    fit.update(x=x_range, y=y_fit, name=f'Fit (R²={r_squared:.3f})')
+    traces.append(fit)
+
+    slope_dir = '↑' if slope > 0 else '↓'
+    layout = copy.deepcopy(spec['layout'])
+    layout['title']['text'] = f'{iv_name} vs {vivo_name} — R²={r_squared:.3f} {slope_dir}'
+    layout['xaxis']['title']['text'] = iv_name
+    layout['yaxis']['title']['text'] = vivo_name
+
+    return go.Figure({'data': traces, 'layout': layout}, _validate=False)
 
 
 def plot_correlation_heatmap(r2_matrix, iv_names, vivo_names, slope_matrix):
     """Interactive R² heatmap for Level C correlation matrix."""
-    # Annotations with R² value + slope arrow
-    annotations = []
-    for i in range(len(iv_names)):
-        for j in range(len(vivo_names)):
-            arrow = '↑' if slope_matrix[i, j] > 0 else '↓'
-            annotations.append(f"{r2_matrix[i, j]:.2f} {arrow}")
-
-    text_matrix = np.array(annotations).reshape(len(iv_names), len(vivo_names))
+    # Annotations with R² value + slope arrow, formatted for the whole
+    # matrix at once
+    arrows = np.where(np.asarray(slope_matrix) > 0, ' ↑', ' ↓')
+    text_matrix = np.char.add(np.char.mod('%.2f', r2_matrix), arrows)
 
     fig = go.Figure(data=go.Heatmap(
         z=r2_matrix,
@@ -383,10 +541,10 @@ def plot_correlation_heatmap(r2_matrix, iv_names, vivo_names, slope_matrix):
         colorscale='Blues',
         zmin=0, zmax=1,
         colorbar=dict(title='R²'),
-    ))
+    ), layout=_BASE_LAYOUT)
 
     fig.update_layout(
-        **_base_layout(title='Level C Correlation Matrix (R² + Slope Direction)'),
+        title='Level C Correlation Matrix (R² + Slope Direction)',
         xaxis=dict(title='In Vivo Parameter', side='bottom'),
         yaxis=dict(title='In Vitro Parameter', autorange='reversed'),
         height=500,
@@ -401,24 +559,26 @@ def plot_f1_f2_bars(f1_f2_results):
     f2_vals = [f1_f2_results[p]['f2'] for p in pairs]
 
     fig = make_subplots(rows=1, cols=2,
-                        subplot_titles=['f1 (Difference Factor)', 'f2 (Similarity Factor)'])
+                        subplot_titles=['f1 (Difference Factor)', 'f2 (Similarity Factor)'],
+                        figure=go.Figure(layout=_BASE_LAYOUT))
 
-    # f1 bars
     f1_colors = [COLORS['success'] if v <= 15 else COLORS['danger'] for v in f1_vals]
-    fig.add_trace(go.Bar(x=pairs, y=f1_vals, marker_color=f1_colors,
-                         name='f1', showlegend=False), row=1, col=1)
+    f2_colors = [COLORS['success'] if v >= 50 else COLORS['danger'] for v in f2_vals]
+    fig.add_traces([
+        go.Bar(x=pairs, y=f1_vals, marker_color=f1_colors,
+               name='f1', showlegend=False),
+        go.Bar(x=pairs, y=f2_vals, marker_color=f2_colors,
+               name='f2', showlegend=False),
+    ], rows=[1, 1], cols=[1, 2])
+
+    # Thresholds (after the bars: add_hline skips subplots without traces)
     fig.add_hline(y=15, line_dash='dash', line_color='red',
                   annotation_text='f1 ≤ 15 (Similar)', row=1, col=1)
-
-    # f2 bars
-    f2_colors = [COLORS['success'] if v >= 50 else COLORS['danger'] for v in f2_vals]
-    fig.add_trace(go.Bar(x=pairs, y=f2_vals, marker_color=f2_colors,
-                         name='f2', showlegend=False), row=1, col=2)
     fig.add_hline(y=50, line_dash='dash', line_color='green',
                   annotation_text='f2 ≥ 50 (Similar)', row=1, col=2)
 
     fig.update_layout(
-        **_base_layout(title='f1/f2 Dissolution Similarity Analysis'),
+        title='f1/f2 Dissolution Similarity Analysis',
         height=400,
     )
     return fig
@@ -6,23 +6,85 @@ for educational/demonstration purposes only.
 No real experimental data is used.
 """
 
+import functools
+
 import numpy as np
 from .dissolution_models import (
     first_order_release, weibull_release,
-    compute_mdt, compute_de, compute_f1_f2
+    compute_mdt, compute_vdt, compute_de, compute_f1_f2
 )
 from .pk_models import (
     one_compartment_oral, impulse_response_1comp,
     convolve_dissolution_pk, biexponential_depot,
-    compute_auc, compute_mrt
+    compute_auc, compute_auc_cumulative, compute_mrt
 )
-from .deconvolution import wagner_nelson
+from .deconvolution import wagner_nelson_batch
+from .ivivc_calculations import interpolation_matrix
+
+# Bump whenever the content or keys of the generated data change, so that
+# results persisted to disk by the pages are not reused across versions.
+DATA_VERSION = 8
+
+
+def _freeze(value):
+    """Mark every array in a generated result read-only (in place)."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif isinstance(value, list):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _fresh_containers(value):
+    """Copy the dicts/lists of a cached result, sharing its read-only arrays."""
+    if isinstance(value, dict):
+        return {key: _fresh_containers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fresh_containers(item) for item in value]
+    return value
+
+
+def _memoize(maxsize):
+    """
+    Cache a generator on its arguments.
+
+    Repeated calls with the same parameters skip the numerical pipeline and
+    return the cached arrays as read-only views; the surrounding dicts are
+    fresh for each call, so callers can still add or replace entries.
+    """
+    def decorate(func):
+        cached = functools.lru_cache(maxsize=maxsize)(
+            lambda *args, **kwargs: _freeze(func(*args, **kwargs))
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return _fresh_containers(cached(*args, **kwargs))
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorate
 
 
 # =============================================================================
 # Level A — Extended-Release Oral Tablet Scenario
 # =============================================================================
 
+# Fixed scenario constants, shared with the pages so that predictions for the
+# same drug need not look them up in (or copy) a generated data dict
+LEVEL_A_KE = 0.10     # h⁻¹
+LEVEL_A_VD = 50.0     # L
+LEVEL_A_DOSE = 100.0  # mg
+LEVEL_A_TIMES_FINE = np.linspace(0, 24, 500)  # For smooth curves
+LEVEL_A_TIMES_FINE.flags.writeable = False
+
+
+@_memoize(maxsize=64)
 def generate_level_a_data(k_fast=0.30, k_medium=0.15, k_slow=0.08):
     """
     Generate synthetic Level A data: 3 ER oral formulations + IR reference.
@@ -47,62 +109,93 @@ def generate_level_a_data(k_fast=0.30, k_medium=0.15, k_slow=0.08):
         'times_dissolution', 'times_pk', 'times_fine',
         'dissolution_profiles', 'pk_profiles',
         'fraction_absorbed', 'ir_dissolution', 'ir_pk',
-        'pk_params', 'dissolution_params', 'ke'
+        'pk_params', 'dissolution_params', 'ke',
+        'dissolution_matrix', 'pk_matrix', 'fraction_absorbed_matrix',
+        'dissolution_fine_matrix', 'pk_fine_matrix'
+        (2D arrays, one row per formulation in 'formulation_names' order),
+        all profiles on 'times_fine' being float32 (plotting only),
+        'pk_to_dissolution_weights' (interpolation_matrix from the PK grid
+        onto the dissolution timepoints)
     """
     # PK parameters
-    ke = 0.10   # h⁻¹
-    vd = 50.0   # L
-    dose = 100.0  # mg
+    ke = LEVEL_A_KE
+    vd = LEVEL_A_VD
+    dose = LEVEL_A_DOSE
 
     # Time vectors
     times_diss = np.array([0, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 10, 12, 16, 20, 24])
     times_pk = np.array([0, 0.5, 1, 2, 3, 4, 6, 8, 10, 12, 16, 20, 24])
-    times_fine = np.linspace(0, 24, 500)  # For smooth curves
+    times_fine = LEVEL_A_TIMES_FINE
 
-    # Dissolution rates
-    k_values = {'F1 (Fast)': k_fast, 'F2 (Medium)': k_medium, 'F3 (Slow)': k_slow}
     formulation_names = ['F1 (Fast)', 'F2 (Medium)', 'F3 (Slow)']
 
-    dissolution_profiles = {}
-    dissolution_profiles_fine = {}
-    pk_profiles = {}
-    pk_profiles_fine = {}
+    # Dissolution rates, one row per formulation plus a last row for the IR
+    # reference; every profile below is computed for all of them at once as
+    # a (n_formulations + 1, n_t) array, and the IR row is then split off
+    k_values = np.array([k_fast, k_medium, k_slow], dtype=float)
+    k_col = np.append(k_values, 5.0)[:, np.newaxis]  # IR: very fast
+    # ka = k (dissolution-rate limited, so absorption rate ≈ dissolution rate),
+    # absorption slightly faster than dissolution; IR ka = 5 h⁻¹
+    ka_col = np.append(k_values * 1.5, 5.0)[:, np.newaxis]
+
+    # The dense curves are only ever plotted, and plotly.js draws them in
+    # single precision anyway, so they are evaluated in float32; everything
+    # the parameters are derived from stays float64
+    times_fine32 = times_fine.astype(np.float32)
+
+    # Dissolution
+    diss_all = first_order_release(times_diss, k_col, f_max=100.0)
+    diss_fine_all = first_order_release(times_fine32, k_col.astype(np.float32), f_max=100.0)
+    diss_matrix, ir_diss = diss_all[:-1], diss_all[-1]
+    diss_fine_matrix, ir_diss_fine = diss_fine_all[:-1], diss_fine_all[-1]
+
+    # PK via analytical 1-compartment oral model
+    pk_all = one_compartment_oral(times_pk, dose, ka_col, ke, vd)
+    pk_fine_all = one_compartment_oral(times_fine32, dose, ka_col.astype(np.float32), ke, vd)
+    pk_matrix, ir_pk = pk_all[:-1], pk_all[-1]
+    pk_fine_matrix, ir_pk_fine = pk_fine_all[:-1], pk_fine_all[-1]
+
+    # One cumulative trapezoidal pass over C(t) and t·C(t) gives the
+    # AUC(0,t) used by Wagner-Nelson as well as AUC and AUMC (last points)
+    auc_cumulative, aumc_cumulative = compute_auc_cumulative(
+        times_pk, np.stack((pk_matrix, times_pk * pk_matrix)))
+
+    # Wagner-Nelson deconvolution
+    wn = wagner_nelson_batch(times_pk, pk_matrix, ke, auc_cumulative=auc_cumulative)
+
+    # PK parameters
+    auc = auc_cumulative[:, -1]
+    mrt = np.divide(aumc_cumulative[:, -1], auc, out=np.zeros_like(auc), where=auc != 0)
+    peak = np.argmax(pk_matrix, axis=1)
+    cmax = pk_matrix[np.arange(len(peak)), peak]
+    tmax = times_pk[peak]
+
+    # Back to per-formulation views for the dict-based consumers
+    dissolution_profiles = dict(zip(formulation_names, diss_matrix))
+    dissolution_profiles_fine = dict(zip(formulation_names, diss_fine_matrix))
+    pk_profiles = dict(zip(formulation_names, pk_matrix))
+    pk_profiles_fine = dict(zip(formulation_names, pk_fine_matrix))
     fraction_absorbed = {}
     pk_params = {}
     dissolution_params = {}
 
-    for name in formulation_names:
-        k = k_values[name]
-
-        # Dissolution
-        diss = first_order_release(times_diss, k, f_max=100.0)
-        diss_fine = first_order_release(times_fine, k, f_max=100.0)
-        dissolution_profiles[name] = diss
-        dissolution_profiles_fine[name] = diss_fine
-
-        # PK via analytical 1-compartment oral model
-        # ka = k (dissolution-rate limited, so absorption rate ≈ dissolution rate)
-        ka = k * 1.5  # absorption slightly faster than dissolution
-        pk = one_compartment_oral(times_pk, dose, ka, ke, vd)
-        pk_fine = one_compartment_oral(times_fine, dose, ka, ke, vd)
-        pk_profiles[name] = pk
-        pk_profiles_fine[name] = pk_fine
-
-        # Wagner-Nelson deconvolution
-        wn = wagner_nelson(times_pk, pk, ke)
-        fraction_absorbed[name] = wn
-
-        # PK parameters
-        cmax = float(np.max(pk))
-        tmax = float(times_pk[np.argmax(pk)])
-        auc = compute_auc(times_pk, pk)
-        mrt = compute_mrt(times_pk, pk)
+    for i, name in enumerate(formulation_names):
+        k = float(k_values[i])
+        diss = diss_matrix[i]
+
+        fraction_absorbed[name] = {
+            'times': wn['times'],
+            'fraction_absorbed': wn['fraction_absorbed'][i],
+            'auc_cumulative': wn['auc_cumulative'][i],
+            'auc_total': float(wn['auc_total'][i]),
+            'amount_absorbed': wn['amount_absorbed'][i],
+        }
 
         pk_params[name] = {
-            'Cmax': cmax,
-            'Tmax': tmax,
-            'AUC': auc,
-            'MRT': mrt,
+            'Cmax': float(cmax[i]),
+            'Tmax': float(tmax[i]),
+            'AUC': float(auc[i]),
+            'MRT': float(mrt[i]),
         }
 
         # Dissolution parameters
@@ -117,12 +210,6 @@ def generate_level_a_data(k_fast=0.30, k_medium=0.15, k_slow=0.08):
             'k': k,
         }
 
-    # IR reference
-    ir_diss = first_order_release(times_diss, k=5.0, f_max=100.0)  # Very fast
-    ir_diss_fine = first_order_release(times_fine, k=5.0, f_max=100.0)
-    ir_pk = one_compartment_oral(times_pk, dose, ka=5.0, ke=ke, vd=vd)
-    ir_pk_fine = one_compartment_oral(times_fine, dose, ka=5.0, ke=ke, vd=vd)
-
     return {
         'times_dissolution': times_diss,
         'times_pk': times_pk,
@@ -142,6 +229,12 @@ def generate_level_a_data(k_fast=0.30, k_medium=0.15, k_slow=0.08):
         'vd': vd,
         'dose': dose,
         'formulation_names': formulation_names,
+        'dissolution_matrix': diss_matrix,
+        'pk_matrix': pk_matrix,
+        'fraction_absorbed_matrix': wn['fraction_absorbed'],
+        'dissolution_fine_matrix': diss_fine_matrix,
+        'pk_fine_matrix': pk_fine_matrix,
+        'pk_to_dissolution_weights': interpolation_matrix(times_diss, times_pk),
     }
 
 
@@ -156,6 +249,9 @@ def generate_level_b_data(k_fast=0.30, k_medium=0.15, k_slow=0.08,
     Generate Level B data (MDT vs MRT) from Level A scenario,
     plus a pathological example showing limitation of Level B.
 
+    Combines generate_level_b_moments and generate_pathological_example,
+    which can also be called (and cached) separately.
+
     Parameters
     ----------
     k_fast, k_medium, k_slow : float
@@ -173,31 +269,72 @@ def generate_level_b_data(k_fast=0.30, k_medium=0.15, k_slow=0.08,
         'formulation_names', 'mdt_values', 'mrt_values',
         'pathological_example' (two formulations with same MDT, different PK)
     """
+    data = generate_level_b_moments(k_fast=k_fast, k_medium=k_medium,
+                                    k_slow=k_slow)
+    data['pathological'] = generate_pathological_example(
+        p1_burst_frac=p1_burst_frac, p1_burst_k=p1_burst_k, p2_k=p2_k,
+    )
+    return data
+
+
+def generate_level_b_moments(k_fast=0.30, k_medium=0.15, k_slow=0.08):
+    """
+    Level B statistical moments (MDT, MRT, VDT) of the Level A scenario.
+
+    Parameters
+    ----------
+    k_fast, k_medium, k_slow : float
+        Dissolution rate constants for the 3 ER formulations (h⁻¹).
+
+    Returns
+    -------
+    dict with keys:
+        'formulation_names', 'mdt_values', 'mrt_values', 'vdt_values',
+        'level_a_data'
+    """
     # Get Level A data for standard comparison
     data_a = generate_level_a_data(k_fast=k_fast, k_medium=k_medium,
                                     k_slow=k_slow)
 
-    mdt_values = {}
-    mrt_values = {}
-    vdt_values = {}  # Variance of dissolution time
-
-    for name in data_a['formulation_names']:
-        mdt_values[name] = data_a['dissolution_params'][name]['MDT']
-        mrt_values[name] = data_a['pk_params'][name]['MRT']
-
-        # VDT calculation
-        times = data_a['times_dissolution']
-        diss = data_a['dissolution_profiles'][name]
-        delta_f = np.diff(diss)
-        t_mid = (times[:-1] + times[1:]) / 2.0
-        mdt = mdt_values[name]
-        total_df = np.sum(delta_f)
-        if total_df > 0:
-            vdt = np.sum((t_mid - mdt) ** 2 * delta_f) / total_df
-        else:
-            vdt = 0
-        vdt_values[name] = vdt
+    names = data_a['formulation_names']
+    mdt = np.array([data_a['dissolution_params'][n]['MDT'] for n in names])
+    mrt = np.array([data_a['pk_params'][n]['MRT'] for n in names])
+
+    # VDT (variance of dissolution time) for all formulations at once
+    vdt = compute_vdt(data_a['times_dissolution'], data_a['dissolution_matrix'], mdt)
 
+    mdt_values = dict(zip(names, mdt.tolist()))
+    mrt_values = dict(zip(names, mrt.tolist()))
+    vdt_values = dict(zip(names, vdt.tolist()))
+
+    return {
+        'formulation_names': data_a['formulation_names'],
+        'mdt_values': mdt_values,
+        'mrt_values': mrt_values,
+        'vdt_values': vdt_values,
+        'level_a_data': data_a,
+    }
+
+
+def generate_pathological_example(p1_burst_frac=40.0, p1_burst_k=2.0, p2_k=0.16):
+    """
+    Two formulations with similar MDT but different profile shapes and PK.
+
+    Parameters
+    ----------
+    p1_burst_frac : float
+        Fraction of dose in burst phase for pathological P1 (%).
+    p1_burst_k : float
+        Burst phase rate constant for P1 (h⁻¹).
+    p2_k : float
+        First-order dissolution rate constant for P2 (h⁻¹).
+
+    Returns
+    -------
+    dict with keys:
+        'times', 'P1_dissolution', 'P2_dissolution', 'P1_pk', 'P2_pk',
+        'MDT_P1', 'MDT_P2', 'MRT_P1', 'MRT_P2'
+    """
     # Pathological example: two formulations with same MDT but different profiles
     times_path = np.linspace(0, 24, 100)
 
@@ -225,22 +362,15 @@ def generate_level_b_data(k_fast=0.30, k_medium=0.15, k_slow=0.08,
     mrt_p2 = compute_mrt(times_path, p2_pk)
 
     return {
-        'formulation_names': data_a['formulation_names'],
-        'mdt_values': mdt_values,
-        'mrt_values': mrt_values,
-        'vdt_values': vdt_values,
-        'level_a_data': data_a,
-        'pathological': {
-            'times': times_path,
-            'P1_dissolution': p1_release,
-            'P2_dissolution': p2_release,
-            'P1_pk': p1_pk,
-            'P2_pk': p2_pk,
-            'MDT_P1': mdt_p1,
-            'MDT_P2': mdt_p2,
-            'MRT_P1': mrt_p1,
-            'MRT_P2': mrt_p2,
-        },
+        'times': times_path,
+        'P1_dissolution': p1_release,
+        'P2_dissolution': p2_release,
+        'P1_pk': p1_pk,
+        'P2_pk': p2_pk,
+        'MDT_P1': mdt_p1,
+        'MDT_P2': mdt_p2,
+        'MRT_P1': mrt_p1,
+        'MRT_P2': mrt_p2,
     }
 
 
@@ -248,6 +378,7 @@ def generate_level_b_data(k_fast=0.30, k_medium=0.15, k_slow=0.08,
 # Level C — PLGA Depot Scenario (matches ivivc-level-c-viz architecture)
 # =============================================================================
 
+@_memoize(maxsize=32)
 def generate_level_c_data(
     # Formulation A Weibull params
     fmax_A=88, tau_A=300, beta_A=0.75, burst_A=15, burst_tau_A=8,
@@ -279,19 +410,22 @@ def generate_level_c_data(
     pk_times_h = np.array([0.5, 1, 2, 4, 6, 8, 12, 24, 48, 72, 168, 336, 504, 672, 840])
     pk_times_d = pk_times_h / 24.0
 
-    # In vitro release profiles (Weibull model)
-    release_A = weibull_release(iv_times_h, fmax=fmax_A, tau=tau_A, beta=beta_A,
-                                burst_frac=burst_A, burst_tau=burst_tau_A)
-    release_B = weibull_release(iv_times_h, fmax=fmax_B, tau=tau_B, beta=beta_B,
-                                burst_frac=burst_B, burst_tau=burst_tau_B)
-    release_C = weibull_release(iv_times_h, fmax=fmax_C, tau=tau_C, beta=beta_C,
-                                burst_frac=burst_C, burst_tau=burst_tau_C)
+    # In vitro release profiles (Weibull model), all three formulations in
+    # one broadcast: each parameter is a column, one row per formulation
+    weibull_params = np.array([
+        [fmax_A, tau_A, beta_A, burst_A, burst_tau_A],
+        [fmax_B, tau_B, beta_B, burst_B, burst_tau_B],
+        [fmax_C, tau_C, beta_C, burst_C, burst_tau_C],
+    ], dtype=float)
+    fmax, tau, beta, burst, burst_tau = weibull_params.T[:, :, None]
+    release_A, release_B, release_C = weibull_release(
+        iv_times_h, fmax=fmax, tau=tau, beta=beta,
+        burst_frac=burst, burst_tau=burst_tau)
     release_sol = np.minimum(100, 100 * (1 - np.exp(-0.5 * iv_times_h)))
 
-    # PK profiles (bi-exponential depot)
-    pk_A = biexponential_depot(pk_times_h, *pk_A_params)
-    pk_B = biexponential_depot(pk_times_h, *pk_B_params)
-    pk_C = biexponential_depot(pk_times_h, *pk_C_params)
+    # PK profiles (bi-exponential depot), broadcast the same way
+    pk_params = np.array([pk_A_params, pk_B_params, pk_C_params], dtype=float)
+    pk_A, pk_B, pk_C = biexponential_depot(pk_times_h, *pk_params.T[:, :, None])
 
     # Normalize to C/Cmax of A
     cmax_A = np.max(pk_A)
@@ -301,25 +435,24 @@ def generate_level_c_data(
 
     formulations = ['A (Low MW)', 'B (Medium MW)', 'C (High MW)']
 
-    # Derive in vitro parameters
-    def get_release_at(times, release, target_h):
-        idx = np.argmin(np.abs(times - target_h))
-        return float(release[idx])
+    # Derive in vitro parameters. The sampling times are sorted, so the
+    # nearest sample to each target is found once with searchsorted and
+    # reused for every formulation (ties go to the earlier sample)
+    release_targets = {'%Rel 1h': 1, '%Rel 6h': 6, '%Rel 24h': 24, '%Rel 72h': 72,
+                       '%Rel 7d': 168, '%Rel 14d': 336}
+    targets = np.array(list(release_targets.values()), dtype=float)
+    upper = np.clip(np.searchsorted(iv_times_h, targets), 1, len(iv_times_h) - 1)
+    lower = upper - 1
+    nearest = np.where(targets - iv_times_h[lower] <= iv_times_h[upper] - targets,
+                       lower, upper)
 
     iv_params = {}
     for name, rel in zip(formulations, [release_A, release_B, release_C]):
         mdt = compute_mdt(iv_times_h, rel)
         de = compute_de(iv_times_h, rel)
-        iv_params[name] = {
-            '%Rel 1h': get_release_at(iv_times_h, rel, 1),
-            '%Rel 6h': get_release_at(iv_times_h, rel, 6),
-            '%Rel 24h': get_release_at(iv_times_h, rel, 24),
-            '%Rel 72h': get_release_at(iv_times_h, rel, 72),
-            '%Rel 7d': get_release_at(iv_times_h, rel, 168),
-            '%Rel 14d': get_release_at(iv_times_h, rel, 336),
-            'MDT (h)': mdt,
-            'DE (%)': de,
-        }
+        iv_params[name] = dict(zip(release_targets, rel[nearest].tolist()))
+        iv_params[name]['MDT (h)'] = mdt
+        iv_params[name]['DE (%)'] = de
 
     # Derive in vivo parameters
     vivo_params = {}
@@ -338,23 +471,33 @@ def generate_level_c_data(
             'Tmax (h)': tmax,
         }
 
-    # f1/f2 analysis
-    f1_f2_results = {}
+    # Same parameters as (n_params, n_formulations) arrays, with row/column
+    # index maps, so a parameter is selected by slicing rather than by
+    # walking the per-formulation dicts
+    iv_param_index = {p: i for i, p in enumerate(iv_params[formulations[0]])}
+    vivo_param_index = {p: i for i, p in enumerate(vivo_params[formulations[0]])}
+    iv_params_matrix = np.array(
+        [[iv_params[name][p] for name in formulations] for p in iv_param_index]
+    )
+    vivo_params_matrix = np.array(
+        [[vivo_params[name][p] for name in formulations] for p in vivo_param_index]
+    )
+
+    # f1/f2 analysis: every ordered pair of the formulations and the
+    # solution in one broadcast, as matrices indexed [reference, test]
+    profile_index = {name: i for i, name in enumerate(formulations + ['Solution'])}
+    profiles = np.stack([release_A, release_B, release_C, release_sol])
+    f1_matrix, f2_matrix = compute_f1_f2(profiles[:, np.newaxis], profiles[np.newaxis])
+
     pairs = [('A (Low MW)', 'B (Medium MW)'),
              ('A (Low MW)', 'C (High MW)'),
              ('B (Medium MW)', 'C (High MW)')]
-    release_map = {'A (Low MW)': release_A, 'B (Medium MW)': release_B,
-                   'C (High MW)': release_C}
+    pairs += [(name, 'Solution') for name in formulations]  # also vs solution
+    f1_f2_results = {}
     for ref_name, test_name in pairs:
-        f1, f2 = compute_f1_f2(release_map[ref_name], release_map[test_name])
+        i, j = profile_index[ref_name], profile_index[test_name]
         label = f"{ref_name.split(' ')[0]} vs {test_name.split(' ')[0]}"
-        f1_f2_results[label] = {'f1': f1, 'f2': f2}
-
-    # Also vs solution
-    for name in formulations:
-        f1, f2 = compute_f1_f2(release_map[name], release_sol)
-        label = f"{name.split(' ')[0]} vs Solution"
-        f1_f2_results[label] = {'f1': f1, 'f2': f2}
+        f1_f2_results[label] = {'f1': f1_matrix[i, j], 'f2': f2_matrix[i, j]}
 
     return {
         'iv_times_h': iv_times_h,
@@ -373,7 +516,12 @@ def generate_level_c_data(
             'C (High MW)': pk_C_norm,
         },
         'formulations': formulations,
+        'formulation_index': {name: j for j, name in enumerate(formulations)},
         'iv_params': iv_params,
         'vivo_params': vivo_params,
+        'iv_params_matrix': iv_params_matrix,
+        'iv_param_index': iv_param_index,
+        'vivo_params_matrix': vivo_params_matrix,
+        'vivo_param_index': vivo_param_index,
         'f1_f2': f1_f2_results,
     }